@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from jobbot.config import DEFAULT_ROUTING, ScrapeOptions, WorkdaySource
+from jobbot.filters import Prefilter, posting_window
+from jobbot.models import JobPosting
+from jobbot.notifier import DiscordNotifier
+from jobbot.ratelimit import RateLimiter
+from jobbot.routing import Router
+from jobbot.scraper import SourceRef, flatten, scrape_sources_async
+from jobbot.store import DedupeStore
+
+TITLES = [
+    "Software Engineer",
+    "Senior Data Engineer",
+    "Data Analyst",
+    "Product Designer",
+    "Account Executive",
+    "Staff Software Engineer, Infrastructure",
+    "Recruiter",
+    "Data Scientist, Growth",
+]
+WEBHOOK_URL = "https://discord.test/api/webhooks/1/bench"
+
+
+@dataclass
+class BenchConfig:
+    greenhouse_boards: int = 100
+    lever_boards: int = 50
+    workday_tenants: int = 10
+    jobs_per_board: int = 200
+    recent_fraction: float = 0.05
+    latency_ms: float = 20.0
+    rate_429: float = 0.0
+    notify_limit: int = 200
+    seed: int = 7
+
+
+@dataclass
+class StageStats:
+    name: str
+    wall_s: float = 0.0
+    requests: int = 0
+    bytes: int = 0
+    peak_mb: float = 0.0
+    items: int = 0
+
+    def as_row(self) -> str:
+        return (
+            f"| {self.name} | {self.wall_s:.3f} | {self.requests} | {self.bytes / 1e6:.2f} "
+            f"| {self.peak_mb:.1f} | {self.items} |"
+        )
+
+
+@dataclass
+class Traffic:
+    requests: int = 0
+    bytes: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, response: httpx.Response) -> httpx.Response:
+        self.requests += 1
+        self.bytes += len(response.content)
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+
+class SyntheticBoards:
+    def __init__(self, config: BenchConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.traffic = Traffic()
+        self._payloads: Dict[str, bytes] = {}
+        self._jobs: Dict[str, list] = {}
+
+    def _posted(self, index: int) -> datetime:
+        now = datetime.now(timezone.utc)
+        if self.rng.random() < self.config.recent_fraction:
+            return now - timedelta(hours=self.rng.randint(0, 20))
+        return now - timedelta(days=3 + index % 60)
+
+    def greenhouse_body(self, handle: str) -> bytes:
+        if handle not in self._payloads:
+            jobs = [
+                {
+                    "id": i,
+                    "title": TITLES[i % len(TITLES)],
+                    "absolute_url": f"https://boards.greenhouse.io/{handle}/jobs/{i}",
+                    "location": {"name": "Remote"},
+                    "updated_at": self._posted(i).isoformat(),
+                }
+                for i in range(self.config.jobs_per_board)
+            ]
+            self._payloads[handle] = json.dumps({"jobs": jobs}).encode()
+        return self._payloads[handle]
+
+    def lever_body(self, handle: str, skip: int, limit: int) -> bytes:
+        key = f"lever:{handle}"
+        if key not in self._jobs:
+            self._jobs[key] = [
+                {
+                    "id": f"{handle}-{i}",
+                    "text": TITLES[i % len(TITLES)],
+                    "hostedUrl": f"https://jobs.lever.co/{handle}/{i}",
+                    "categories": {"team": handle, "location": "Remote"},
+                    "createdAt": int(self._posted(i).timestamp() * 1000),
+                }
+                for i in range(self.config.jobs_per_board)
+            ]
+        return json.dumps(self._jobs[key][skip : skip + limit]).encode()
+
+    def workday_page(self, tenant: str, offset: int, limit: int) -> bytes:
+        total = self.config.jobs_per_board
+        recent = total * self.config.recent_fraction
+        postings = [
+            {
+                "title": TITLES[i % len(TITLES)],
+                "externalPath": f"/job/{tenant}/{i}",
+                "locationsText": "Bentonville, AR",
+                "postedOn": "Posted Today" if i < recent else f"Posted {3 + i % 25} Days Ago",
+                "bulletFields": [f"R{i}"],
+            }
+            for i in range(offset, min(offset + limit, total))
+        ]
+        return json.dumps({"total": total, "jobPostings": postings}).encode()
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        path = request.url.path
+        if host == "boards-api.greenhouse.io":
+            body = self.greenhouse_body(path.split("/")[3])
+        elif host == "api.lever.co":
+            params = request.url.params
+            body = self.lever_body(
+                path.split("/")[3], int(params.get("skip", 0)), int(params.get("limit", 10**6))
+            )
+        elif request.method == "GET":
+            body = b'<html><script>{"csrfToken":"bench-token"}</script></html>'
+            return self.traffic.record(httpx.Response(200, content=body))
+        else:
+            payload = json.loads(request.content)
+            tenant = path.split("/")[3]
+            body = self.workday_page(tenant, payload["offset"], payload["limit"])
+        return self.traffic.record(
+            httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+        )
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.config.latency_ms / 1000)
+        return self.respond(request)
+
+
+class SyntheticDiscord:
+    def __init__(self, config: BenchConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed + 1)
+        self.traffic = Traffic()
+        self.embeds = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(self.config.latency_ms / 1000)
+        if self.rng.random() < self.config.rate_429:
+            return self.traffic.record(
+                httpx.Response(429, headers={"Retry-After": "0.01"}, json={"retry_after": 0.01})
+            )
+        self.embeds += len(json.loads(request.content)["embeds"])
+        headers = {"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "0.01"}
+        return self.traffic.record(httpx.Response(204, headers=headers))
+
+
+def _measure(name: str, traffic: Traffic | None, fn: Callable[[], int]) -> StageStats:
+    before_requests = traffic.requests if traffic else 0
+    before_bytes = traffic.bytes if traffic else 0
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    items = fn()
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    return StageStats(
+        name=name,
+        wall_s=wall,
+        requests=(traffic.requests - before_requests) if traffic else 0,
+        bytes=(traffic.bytes - before_bytes) if traffic else 0,
+        peak_mb=max(0, peak - base) / 1e6,
+        items=items,
+    )
+
+
+def run(config: BenchConfig, workdir: Path) -> List[StageStats]:
+    boards = SyntheticBoards(config)
+    discord = SyntheticDiscord(config)
+    refs = (
+        [SourceRef("greenhouse", f"gh{i}") for i in range(config.greenhouse_boards)]
+        + [SourceRef("lever", f"lv{i}") for i in range(config.lever_boards)]
+        + [
+            SourceRef(
+                "workday",
+                f"wd{i}",
+                WorkdaySource(
+                    tenant=f"wd{i}", site="External", host=f"wd{i}.wd5.myworkdayjobs.com"
+                ),
+            )
+            for i in range(config.workday_tenants)
+        ]
+    )
+    window_start, today = posting_window()
+    store = DedupeStore(workdir / "sent_jobs.json")
+    router = Router(DEFAULT_ROUTING)
+    # Dedupe, keyword and window checks run inside the sources, as in the real pipeline.
+    prefilter = Prefilter(store.has, router, window_start, today)
+    state: dict = {}
+    stats: List[StageStats] = []
+    tracemalloc.start()
+
+    def scrape() -> int:
+        async def go() -> list:
+            transport = httpx.MockTransport(boards.handle_async)
+            async with httpx.AsyncClient(transport=transport, follow_redirects=True) as client:
+                return await scrape_sources_async(
+                    refs,
+                    options=ScrapeOptions(max_concurrency=64),
+                    client=client,
+                    since=window_start,
+                    keep=prefilter,
+                )
+
+        state["jobs"] = flatten(asyncio.run(go()))
+        return prefilter.total
+
+    def filters() -> int:
+        # Only the prefilter survivors are built, so this stage just routes them.
+        by_category: Dict[str, List[JobPosting]] = {}
+        for job in state["jobs"]:
+            by_category.setdefault(router.route(job.title).category, []).append(job)
+        state["routed"] = by_category
+        return len(state["jobs"])
+
+    def dedupe() -> int:
+        fresh = state["jobs"]
+        now_ts = datetime.now(timezone.utc).isoformat()
+        for job in fresh:
+            store.add(job.uid, now_ts)
+        store.save()
+        state["fresh"] = fresh
+        return len(fresh)
+
+    def notify() -> int:
+        jobs = state["fresh"][: config.notify_limit]
+        with httpx.Client(transport=httpx.MockTransport(discord.handle)) as client:
+            notifier = DiscordNotifier(
+                WEBHOOK_URL,
+                batch_size=10,
+                fallback_sleep=0.0,
+                max_retries=20,
+                rate_limiter=RateLimiter(),
+                client=client,
+            )
+            return notifier.send(jobs)
+
+    stats.append(_measure("scrape", boards.traffic, scrape))
+    stats.append(_measure("filter", None, filters))
+    stats.append(_measure("dedupe", None, dedupe))
+    stats.append(_measure("notify", discord.traffic, notify))
+    tracemalloc.stop()
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Offline throughput benchmark with synthetic ATS boards"
+    )
+    parser.add_argument("--greenhouse", type=int, default=100, help="Greenhouse boards")
+    parser.add_argument("--lever", type=int, default=50, help="Lever boards")
+    parser.add_argument("--workday", type=int, default=10, help="Workday tenants")
+    parser.add_argument("--jobs", type=int, default=200, help="Postings per board")
+    parser.add_argument(
+        "--recent", type=float, default=0.05, help="Fraction of postings inside the window"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=20.0, help="Simulated latency per request"
+    )
+    parser.add_argument(
+        "--rate-429", type=float, default=0.0, help="Fraction of Discord posts answered with 429"
+    )
+    parser.add_argument(
+        "--notify-limit", type=int, default=200, help="Max jobs pushed through the notifier"
+    )
+    parser.add_argument("--json", type=Path, help="Also write results to this JSON file")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    config = BenchConfig(
+        greenhouse_boards=args.greenhouse,
+        lever_boards=args.lever,
+        workday_tenants=args.workday,
+        jobs_per_board=args.jobs,
+        recent_fraction=args.recent,
+        latency_ms=args.latency_ms,
+        rate_429=args.rate_429,
+        notify_limit=args.notify_limit,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = run(config, Path(tmp))
+    print("| Stage | Wall (s) | Requests | MB | Peak MB | Items |")
+    print("| --- | --- | --- | --- | --- | --- |")
+    for stage in stats:
+        print(stage.as_row())
+    if args.json:
+        args.json.write_text(json.dumps([stage.__dict__ for stage in stats], indent=2))
+
+
+if __name__ == "__main__":
+    main()
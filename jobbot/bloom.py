@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import struct
+from pathlib import Path
+
+MAGIC = b"JBBF"
+HEADER = struct.Struct(">4sBQBQ")
+VERSION = 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter.
+
+    Sized for ``capacity`` items at ``error_rate``: m = -n*ln(p)/ln(2)^2 bits and
+    k = (m/n)*ln(2) hash functions. While ``count <= capacity`` the false-positive
+    probability stays at or below ``error_rate``; past that it degrades as
+    (1 - e^(-k*count/m))^k, which ``false_positive_rate()`` reports.
+    """
+
+    def __init__(
+        self, num_bits: int, num_hashes: int, count: int = 0, bits: bytes | None = None
+    ) -> None:
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self.bits = bytearray(bits) if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def add(self, item: str) -> None:
+        for index in self._indexes(item):
+            self.bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return self.contains_hashes(*hash_pair(item))
+
+    def contains_hashes(self, h1: int, h2: int) -> bool:
+        # Lets a caller probe several filters with one digest of the item.
+        bits, num_bits = self.bits, self.num_bits
+        for i in range(self.num_hashes):
+            index = (h1 + i * h2) % num_bits
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    def false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, path: Path) -> None:
+        header = HEADER.pack(MAGIC, VERSION, self.num_bits, self.num_hashes, self.count)
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_bytes(header + bytes(self.bits))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        raw = path.read_bytes()
+        magic, version, num_bits, num_hashes, count = HEADER.unpack_from(raw)
+        if magic != MAGIC or version != VERSION:
+            raise RuntimeError(f"Unsupported bloom filter file: {path}")
+        return cls(num_bits, num_hashes, count, raw[HEADER.size :])
+
+    def _indexes(self, item: str):
+        h1, h2 = hash_pair(item)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+
+def hash_pair(item: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    h1, h2 = struct.unpack(">QQ", digest)
+    return h1, h2 | 1
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import yaml
-from pydantic import BaseModel, Field, HttpUrl, ValidationError
+from pydantic import BaseModel, Field, HttpUrl, ValidationError, field_validator
+
+
+# Snapshot hits rebuild the models without validation; bump when a config model changes.
+SNAPSHOT_SCHEMA = 7
 
 
 class WorkdaySource(BaseModel):
@@ -13,29 +18,122 @@ class WorkdaySource(BaseModel):
     site: str
     host: str
     limit: int = Field(default=50, ge=1, le=200)
+    max_postings: int = Field(default=5000, ge=1)
     search_text: str = ""
     locale: str = "en-US"
     applied_facets: Dict[str, List[str]] = Field(default_factory=dict)
 
 
+class LeverSource(BaseModel):
+    handle: str
+    page_size: int = Field(default=100, ge=1)
+    max_postings: int = Field(default=5000, ge=1)
+    team: List[str] = Field(default_factory=list)
+    department: List[str] = Field(default_factory=list)
+    location: List[str] = Field(default_factory=list)
+    commitment: List[str] = Field(default_factory=list)
+
+
+class ScrapeOptions(BaseModel):
+    max_concurrency: int = Field(default=16, ge=1)
+    host_limits: Dict[str, int] = Field(
+        default_factory=lambda: {"boards-api.greenhouse.io": 8, "api.lever.co": 4}
+    )
+    default_host_limit: int = Field(default=4, ge=1)
+    timeout: float = Field(default=30.0, gt=0)
+    http2: bool = True
+    keepalive_expiry: float = Field(default=30.0, ge=0)
+
+
+class PollingOptions(BaseModel):
+    min_interval: float = Field(default=300.0, gt=0)
+    max_interval: float = Field(default=21600.0, gt=0)
+    speedup: float = Field(default=0.5, gt=0, le=1)
+    backoff: float = Field(default=1.5, ge=1)
+    smoothing: float = Field(default=0.3, gt=0, le=1)
+
+
+class HealthOptions(BaseModel):
+    failure_threshold: int = Field(default=2, ge=1)
+    base_backoff: float = Field(default=900.0, gt=0)
+    max_backoff: float = Field(default=86400.0, gt=0)
+
+
 class SourceConfig(BaseModel):
     greenhouse: List[str] = Field(default_factory=list)
-    lever: List[str] = Field(default_factory=list)
+    lever: List[LeverSource] = Field(default_factory=list)
     workday: List[WorkdaySource] = Field(default_factory=list)
+    scrape: ScrapeOptions = Field(default_factory=ScrapeOptions)
+    polling: PollingOptions = Field(default_factory=PollingOptions)
+    health: HealthOptions = Field(default_factory=HealthOptions)
+
+    @field_validator("lever", mode="before")
+    @classmethod
+    def _lever_handles(cls, value):
+        # Plain handles stay valid; blanks are dropped like the other providers.
+        return [
+            {"handle": item} if isinstance(item, str) else item
+            for item in value or []
+            if not isinstance(item, str) or item.strip()
+        ]
+
+
+class CategoryRule(BaseModel):
+    name: str
+    webhook: Optional[str] = None
+    include: List[str] = Field(default_factory=list)
+    exclude: List[str] = Field(default_factory=list)
+    word_boundary: bool = False
+
+
+class RoutingConfig(BaseModel):
+    categories: List[CategoryRule] = Field(default_factory=list)
+    fallback: str = "general"
+
+
+DEFAULT_ROUTING = RoutingConfig(
+    categories=[
+        CategoryRule(
+            name="data",
+            webhook="data",
+            include=["data engineer", "data analyst", "data scientist"],
+        ),
+        CategoryRule(name="software", webhook="software", include=["software"]),
+    ],
+)
 
 
 class Settings(BaseModel):
     discord_webhook_url: Optional[HttpUrl] = None
     discord_webhook_url_software: Optional[HttpUrl] = None
     discord_webhook_url_data: Optional[HttpUrl] = None
+    webhooks: Dict[str, HttpUrl] = Field(default_factory=dict)
     sources: SourceConfig
+    routing: RoutingConfig = Field(default_factory=lambda: DEFAULT_ROUTING.model_copy(deep=True))
+
+    def webhook_for(self, name: str) -> Optional[str]:
+        url = self.webhooks.get(name) or self.webhooks.get("general")
+        return str(url) if url else None
+
+
+def _read_yaml(path: Path) -> dict:
+    import yaml
+
+    return yaml.safe_load(path.read_text()) or {}
 
 
 def load_sources(path: Path) -> SourceConfig:
-    data = yaml.safe_load(path.read_text()) or {}
+    data = _read_yaml(path)
     return SourceConfig(**data)
 
 
+def load_routing(path: Path) -> RoutingConfig:
+    if not path.exists():
+        return DEFAULT_ROUTING.model_copy(deep=True)
+    data = _read_yaml(path)
+    return RoutingConfig(**data)
+
+
 def _clean(url: str | None) -> str | None:
     if not url:
         return None
@@ -46,36 +144,164 @@ def _clean(url: str | None) -> str | None:
 def load_webhook_defaults(path: Path) -> dict[str, Optional[str]]:
     if not path.exists():
         return {}
-    data = yaml.safe_load(path.read_text()) or {}
-    return {
+    data = _read_yaml(path)
+    defaults = {
         "general": _clean(data.get("general")),
         "software": _clean(data.get("software")),
         "data": _clean(data.get("data")),
     }
+    for name, url in data.items():
+        defaults.setdefault(str(name), _clean(url))
+    return defaults
+
 
+def _webhooks_from_env(names: List[str]) -> dict[str, Optional[str]]:
+    found = {"general": _clean(os.getenv("DISCORD_WEBHOOK_URL"))}
+    for name in names:
+        if name != "general":
+            found[name] = _clean(os.getenv(f"DISCORD_WEBHOOK_URL_{name.upper()}"))
+    return found
 
-def load_settings(config_path: Path, webhook_config: Path | None = None) -> Settings:
-    webhook = _clean(os.getenv("DISCORD_WEBHOOK_URL"))
-    webhook_software = _clean(os.getenv("DISCORD_WEBHOOK_URL_SOFTWARE"))
-    webhook_data = _clean(os.getenv("DISCORD_WEBHOOK_URL_DATA"))
-    if webhook_config is None:
-        webhook_config = Path("config/webhooks.yaml")
-    defaults = load_webhook_defaults(webhook_config)
-    webhook = webhook or defaults.get("general")
-    webhook_software = webhook_software or defaults.get("software")
-    webhook_data = webhook_data or defaults.get("data")
-    if not any([webhook, webhook_software, webhook_data]):
+
+def load_settings(
+    config_path: Path,
+    webhook_config: Path | None = None,
+    routing_config: Path | None = None,
+) -> Settings:
+    if routing_config is None:
+        routing_config = Path("config/routing.yaml")
+    return _build_settings(load_sources(config_path), load_routing(routing_config), webhook_config)
+
+
+def _build_settings(
+    sources: SourceConfig, routing: RoutingConfig, webhook_config: Path | None = None
+) -> Settings:
+    names = sorted(
+        {"general", routing.fallback} | {rule.webhook or rule.name for rule in routing.categories}
+    )
+    webhooks = {name: url for name, url in _webhooks_from_env(names).items() if url}
+    # Env vars win, so webhooks.yaml is only parsed for names they leave unresolved.
+    if len(webhooks) < len(names):
+        if webhook_config is None:
+            webhook_config = Path("config/webhooks.yaml")
+        defaults = load_webhook_defaults(webhook_config)
+        for name in names:
+            if name not in webhooks and defaults.get(name):
+                webhooks[name] = defaults[name]
+    if not webhooks:
         raise RuntimeError(
             "At least one webhook env var must be set: "
-            "DISCORD_WEBHOOK_URL, DISCORD_WEBHOOK_URL_SOFTWARE, or DISCORD_WEBHOOK_URL_DATA"
+            "DISCORD_WEBHOOK_URL, DISCORD_WEBHOOK_URL_SOFTWARE, DISCORD_WEBHOOK_URL_DATA, "
+            "or DISCORD_WEBHOOK_URL_<CATEGORY> for a category in the routing config"
         )
-    sources = load_sources(config_path)
     try:
         return Settings(
-            discord_webhook_url=webhook,
-            discord_webhook_url_software=webhook_software,
-            discord_webhook_url_data=webhook_data,
+            discord_webhook_url=webhooks.get("general"),
+            discord_webhook_url_software=webhooks.get("software"),
+            discord_webhook_url_data=webhooks.get("data"),
+            webhooks=webhooks,
             sources=sources,
+            routing=routing,
         )
     except ValidationError as exc:
         raise RuntimeError(f"Invalid configuration: {exc}") from exc
+
+
+def load_settings_cached(
+    config_path: Path,
+    webhook_config: Path | None = None,
+    routing_config: Path | None = None,
+    *,
+    snapshot_path: Path = Path(".cache/settings.json"),
+) -> tuple[Settings, bool]:
+    # The snapshot holds the validated sources and routing as JSON, keyed by the config
+    # files' mtime/size (fast path) and content hash. Webhook URLs are secrets, so they
+    # are never written to it and are resolved from env and webhooks.yaml on every load.
+    if routing_config is None:
+        routing_config = Path("config/routing.yaml")
+    paths = [config_path, routing_config]
+    stats = [_stat_key(path) for path in paths]
+    snapshot = _read_snapshot(snapshot_path)
+    hit = False
+    if snapshot:
+        if snapshot["stats"] == stats:
+            hit = True
+        else:
+            digest = _content_digest(paths)
+            if snapshot["digest"] == digest:
+                snapshot["stats"] = stats
+                _write_snapshot(snapshot_path, snapshot)
+                hit = True
+    else:
+        digest = _content_digest(paths)
+    if hit:
+        # The snapshot only ever holds data that passed validation, so skip it here.
+        sources = _construct_sources(snapshot["sources"])
+        routing = _construct_routing(snapshot["routing"])
+    else:
+        sources = load_sources(config_path)
+        routing = load_routing(routing_config)
+        _write_snapshot(
+            snapshot_path,
+            {
+                "schema": SNAPSHOT_SCHEMA,
+                "stats": stats,
+                "digest": digest,
+                "sources": sources.model_dump(mode="json"),
+                "routing": routing.model_dump(mode="json"),
+            },
+        )
+    return _build_settings(sources, routing, webhook_config), hit
+
+
+def _construct_sources(data: dict) -> SourceConfig:
+    return SourceConfig.model_construct(
+        greenhouse=data["greenhouse"],
+        lever=[LeverSource.model_construct(**item) for item in data["lever"]],
+        workday=[WorkdaySource.model_construct(**item) for item in data["workday"]],
+        scrape=ScrapeOptions.model_construct(**data["scrape"]),
+        polling=PollingOptions.model_construct(**data["polling"]),
+        health=HealthOptions.model_construct(**data["health"]),
+    )
+
+
+def _construct_routing(data: dict) -> RoutingConfig:
+    return RoutingConfig.model_construct(
+        categories=[CategoryRule.model_construct(**rule) for rule in data["categories"]],
+        fallback=data["fallback"],
+    )
+
+
+def _stat_key(path: Path) -> list:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return [str(path), None, None]
+    return [str(path), stat.st_mtime_ns, stat.st_size]
+
+
+def _content_digest(paths: List[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(str(path).encode("utf-8"))
+        digest.update(path.read_bytes() if path.exists() else b"\0missing")
+    return digest.hexdigest()
+
+
+def _read_snapshot(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        snapshot = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("schema") != SNAPSHOT_SCHEMA:
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, snapshot: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+    tmp.replace(path)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from typing import Callable
+
+
+class Scheduler:
+    def __init__(
+        self,
+        cycle: Callable[[], object],
+        flush: Callable[[], None],
+        *,
+        interval: float,
+        flush_interval: float,
+    ) -> None:
+        self.cycle = cycle
+        self.flush = flush
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.stop_event = threading.Event()
+
+    def install_signal_handlers(self) -> None:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self._handle_signal)
+
+    def _handle_signal(self, signum: int, frame) -> None:
+        print(f"[daemon] Received signal {signum}; finishing current cycle and shutting down")
+        self.stop_event.set()
+
+    def run(self) -> None:
+        next_flush = time.monotonic() + self.flush_interval
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self.cycle()
+            except Exception as exc:  # noqa: BLE001
+                print(f"[daemon] Poll cycle failed: {exc!r}")
+            if time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = time.monotonic() + self.flush_interval
+            elapsed = time.monotonic() - started
+            self.stop_event.wait(max(0.0, self.interval - elapsed))
+        self.flush()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Set
+
+from jobbot.metrics import METRICS, current_source
+
+if TYPE_CHECKING:
+    from jobbot.routing import Router
+
+FILTERS = ("dedupe", "keywords", "window")
+
+
+class Prefilter:
+    def __init__(
+        self,
+        seen: Callable[[str], bool],
+        router: Router,
+        window_start: date,
+        window_end: date,
+        *,
+        track_uids: bool = False,
+    ) -> None:
+        self.seen = seen
+        self.router = router
+        self.window_start = window_start
+        self.window_end = window_end
+        self.total = 0
+        self.dropped: Dict[str, int] = dict.fromkeys(FILTERS, 0)
+        # Short hashes of every raw uid per source, so the adaptive poller can tell which
+        # ids are new even though most records are dropped here. Only kept when a poller
+        # will read them.
+        self.track_uids = track_uids
+        self._uids: Dict[str, Set[str]] = {}
+
+    # Cheapest predicate first: a set lookup, then one automaton pass over the title,
+    # and only then a timestamp parse.
+    def __call__(
+        self,
+        uid: str,
+        title: str | None,
+        posted_raw: Any,
+        parse_posted: Callable[[Any], datetime | None] | None,
+    ) -> bool:
+        self.total += 1
+        if self.track_uids:
+            self._uids.setdefault(current_source(), set()).add(uid_hash(uid))
+        if self.seen(uid):
+            self.dropped["dedupe"] += 1
+            return False
+        if not self.router.route(title).matched_keywords:
+            self.dropped["keywords"] += 1
+            return False
+        posted_at = posted_raw if parse_posted is None else parse_posted(posted_raw)
+        if not is_within_window(posted_at, self.window_start, self.window_end):
+            self.dropped["window"] += 1
+            return False
+        return True
+
+    def raw_uids(self, source: str) -> Set[str]:
+        return self._uids.get(source, set())
+
+    def kept_after(self, name: str) -> int:
+        kept = self.total
+        for filter_name in FILTERS:
+            kept -= self.dropped[filter_name]
+            if filter_name == name:
+                break
+        return kept
+
+    def record_metrics(self) -> None:
+        for name in FILTERS:
+            METRICS.inc("filter_jobs_total", self.kept_after(name), filter=name, outcome="kept")
+            METRICS.inc("filter_jobs_total", self.dropped[name], filter=name, outcome="dropped")
+
+
+def uid_hash(uid: str) -> str:
+    # 32 bits is plenty to count new ids on one board and keeps the poll state small.
+    return hashlib.blake2b(uid.encode("utf-8"), digest_size=4).hexdigest()
+
+
+def posting_window(now: datetime | None = None) -> tuple[date, date]:
+    today = (now or datetime.now(timezone.utc)).date()
+    return today - timedelta(days=1), today
+
+
+def is_within_window(posted_at: datetime | None, start_date: date, end_date: date) -> bool:
+    if not posted_at:
+        return False
+    if posted_at.tzinfo is None:
+        posted_at = posted_at.replace(tzinfo=timezone.utc)
+    else:
+        posted_at = posted_at.astimezone(timezone.utc)
+    return start_date <= posted_at.date() <= end_date
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from jobbot.config import HealthOptions
+from jobbot.scraper import SourceRef
+
+
+class SourceHealth:
+    def __init__(self, path: Path, options: HealthOptions | None = None) -> None:
+        self.path = path
+        self.options = options or HealthOptions()
+        self.schema = 1
+        self.sources: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return
+        if data.get("schema") == self.schema:
+            self.sources = data.get("sources", {})
+
+    def allow(
+        self, refs: Sequence[SourceRef], now: datetime | None = None
+    ) -> Tuple[List[SourceRef], List[SourceRef]]:
+        now = now or datetime.now(timezone.utc)
+        allowed: List[SourceRef] = []
+        skipped: List[SourceRef] = []
+        for ref in refs:
+            retry_at = (self.sources.get(ref.key) or {}).get("next_retry_at")
+            if retry_at and datetime.fromisoformat(retry_at) > now:
+                skipped.append(ref)
+            else:
+                allowed.append(ref)
+        return allowed, skipped
+
+    def record_success(self, key: str, now: datetime | None = None) -> None:
+        state = self.sources.setdefault(key, {})
+        state["consecutive_failures"] = 0
+        state["next_retry_at"] = None
+        state["last_success_at"] = (now or datetime.now(timezone.utc)).isoformat()
+        self._dirty = True
+
+    def record_failure(self, key: str, error: str, now: datetime | None = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        options = self.options
+        state = self.sources.setdefault(key, {})
+        state["consecutive_failures"] = state.get("consecutive_failures", 0) + 1
+        state["last_error"] = error
+        state["last_failure_at"] = now.isoformat()
+        backoff = 0.0
+        trips = state["consecutive_failures"] - options.failure_threshold
+        if trips >= 0:
+            backoff = min(options.max_backoff, options.base_backoff * 2**trips)
+            state["next_retry_at"] = (now + timedelta(seconds=backoff)).isoformat()
+        else:
+            state["next_retry_at"] = None
+        self._dirty = True
+        return backoff
+
+    def report(self) -> Dict[str, dict]:
+        return {
+            key: state
+            for key, state in sorted(self.sources.items())
+            if state.get("consecutive_failures")
+        }
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema": self.schema, "sources": self.sources}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        self._dirty = False
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+import httpx
+
+from jobbot.metrics import METRICS, current_source, record_response
+from jobbot.models import RawPosting
+
+if TYPE_CHECKING:
+    from jobbot.snapshots import BoardSnapshots
+
+
+class ResponseCache:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.schema = 2
+        self.entries: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return
+        if data.get("schema") != self.schema:
+            return
+        self.entries = data.get("responses", {})
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def lookup(self, url: str, response: httpx.Response) -> List[RawPosting] | None:
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        if response.status_code == 304:
+            return entry["records"]
+        if response.is_success and body_hash(response) == entry.get("hash"):
+            self._remember_validators(entry, response)
+            return entry["records"]
+        return None
+
+    def store(self, url: str, response: httpx.Response, records: List[RawPosting]) -> None:
+        entry = {"hash": body_hash(response), "records": records}
+        self._remember_validators(entry, response)
+        self.entries[url] = entry
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema": self.schema, "responses": self.entries}
+        self.path.write_text(json.dumps(payload, separators=(",", ":")))
+        self._dirty = False
+
+    def _remember_validators(self, entry: dict, response: httpx.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag != entry.get("etag") or last_modified != entry.get("last_modified"):
+            entry["etag"] = etag
+            entry["last_modified"] = last_modified
+            self._dirty = True
+
+
+def parse_response(
+    url: str,
+    response: httpx.Response,
+    extract: Callable[[Any], List[RawPosting]],
+    cache: ResponseCache | None = None,
+    snapshots: BoardSnapshots | None = None,
+    board: str | None = None,
+) -> List[RawPosting]:
+    # The cache keeps the unfiltered raw records rather than postings, so dedupe, keyword
+    # and window predicates can be re-applied to a cached board as they move between runs.
+    record_response(response)
+    source = current_source()
+    board = board or url
+    digest = response_digest(url, response, cache)
+    if snapshots is not None and snapshots.unchanged(board, digest):
+        return []
+    records = None
+    if cache is not None:
+        records = cache.lookup(url, response)
+        if records is not None:
+            METRICS.inc("http_cache_hits_total", source=source)
+    if records is None:
+        response.raise_for_status()
+        with METRICS.timer("parse_seconds", source=source):
+            records = extract(response.json())
+        if cache is not None:
+            cache.store(url, response, records)
+    if snapshots is not None:
+        return snapshots.delta(board, digest, records)
+    return records
+
+
+def response_digest(
+    url: str, response: httpx.Response, cache: ResponseCache | None = None
+) -> str | None:
+    if response.status_code == 304:
+        entry = cache.entries.get(url) if cache is not None else None
+        return entry["hash"] if entry else None
+    return body_hash(response)
+
+
+def body_hash(response: httpx.Response) -> str:
+    return hashlib.sha256(response.content).hexdigest()
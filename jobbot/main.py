@@ -1,19 +1,44 @@
 from __future__ import annotations
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import argparse
-from datetime import datetime, timedelta, timezone
+import asyncio
+import threading
+from datetime import date, datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
-from dotenv import load_dotenv
-
-from jobbot.config import load_settings
-from jobbot.notifier import DiscordNotifier
-from jobbot.scraper import scrape_all
-from jobbot.store import DedupeStore
+from jobbot.config import Settings, load_settings, load_settings_cached
+from jobbot.daemon import Scheduler
+from jobbot.filters import Prefilter, posting_window
+from jobbot.health import SourceHealth
+from jobbot.metrics import METRICS
+from jobbot.outbox import Outbox
+from jobbot.rollups import Rollups
+from jobbot.runs import prune_runs, write_run
+from jobbot.ratelimit import RateLimiter
+from jobbot.routing import Route, Router
+from jobbot.polling import AdaptivePoller
+from jobbot.scraper import (
+    SourceResult,
+    flatten,
+    iter_sources,
+    scrape_sources,
+    scrape_sources_async,
+    select_shard,
+)
+from jobbot.snapshots import BoardSnapshots
+from jobbot.store import DedupeStore, ShardStore
 from jobbot.models import JobPosting
 
-SOFTWARE_KEYWORDS = ["software"]
-DATA_KEYWORDS = ["data engineer", "data analyst", "data scientist"]
+if TYPE_CHECKING:
+    from jobbot.notifier import DiscordNotifier
+
+_IMPORT_FINISHED = time.perf_counter()
+RUN_LOG_DAYS = 7
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -24,146 +49,604 @@ def build_parser() -> argparse.ArgumentParser:
         default=Path("config/sources.yaml"),
         help="Path to sources yaml",
     )
+    parser.add_argument(
+        "--routing",
+        type=Path,
+        default=Path("config/routing.yaml"),
+        help="Path to title routing rules yaml",
+    )
+    parser.add_argument(
+        "--settings-snapshot",
+        type=Path,
+        default=Path(".cache/settings.json"),
+        help="Path to the pre-validated settings snapshot reused while config files are unchanged",
+    )
+    parser.add_argument(
+        "--no-settings-snapshot",
+        action="store_true",
+        help="Always re-read and re-validate the yaml config",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Report time spent on imports, .env loading, settings and runtime setup",
+    )
     parser.add_argument(
         "--store",
         type=Path,
         default=Path("data/sent_jobs.json"),
         help="Path to dedupe store",
     )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=30,
+        help="Demote dedupe entries older than this many days into the on-disk Bloom filter "
+        "(0 disables eviction)",
+    )
+    parser.add_argument(
+        "--http-cache",
+        type=Path,
+        default=Path(".cache/http_cache.json"),
+        help="Path to the conditional-GET response cache for Greenhouse/Lever boards",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Always download full board payloads",
+    )
+    parser.add_argument(
+        "--board-snapshots",
+        type=Path,
+        default=Path(".cache/board_snapshots.json"),
+        help="Path to per-board body hashes and job versions used to emit only changed jobs",
+    )
+    parser.add_argument(
+        "--no-board-snapshots",
+        action="store_true",
+        help="Re-evaluate every job on every board on each run",
+    )
+    parser.add_argument(
+        "--workday-sessions",
+        type=Path,
+        default=Path(".cache/workday_sessions.json"),
+        help="Path to the persisted Workday session/CSRF token cache",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        help="Only scrape shard i of N (1-based, e.g. 2/4); sent jobs are recorded in "
+        "<store>.shard-i-of-N.json for `python -m jobbot.store merge`",
+    )
+    parser.add_argument(
+        "--outbox",
+        type=Path,
+        default=Path("data/outbox.jsonl"),
+        help="Path to the journal of matched jobs awaiting Discord delivery; pending jobs are "
+        "sent before the next scrape",
+    )
+    parser.add_argument(
+        "--rollups",
+        type=Path,
+        default=Path("data/rollups.json"),
+        help="Path to the daily sent/time-to-alert counters per source and category",
+    )
+    parser.add_argument(
+        "--run-log",
+        type=Path,
+        default=Path(".cache/runs"),
+        help="Directory of per-run JSONL snapshots (sources and new postings) read by "
+        "scripts/generate_report.py",
+    )
+    parser.add_argument(
+        "--source-health",
+        type=Path,
+        default=Path(".cache/source_health.json"),
+        help="Path to per-source failure history used to back off from broken boards",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Do not send Discord messages")
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch sources concurrently (limits come from the 'scrape' block in the sources yaml)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and poll on an internal schedule with warm caches and connections",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=300.0,
+        help="Seconds between poll cycles in daemon mode",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=900.0,
+        help="Seconds between cache and store flushes in daemon mode",
+    )
+    parser.add_argument(
+        "--adaptive-polling",
+        action="store_true",
+        help="Only poll sources whose adaptive interval has elapsed "
+        "(state is kept in poll_state.json next to the store)",
+    )
+    parser.add_argument(
+        "--embeds-per-message",
+        type=int,
+        default=10,
+        help="Pack up to this many job embeds into each Discord message (max 10)",
+    )
+    parser.add_argument(
+        "--run-report",
+        type=Path,
+        default=Path(".cache/run_report.json"),
+        help="Write per-source and per-stage timers and counters for each run to this JSON file",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        type=Path,
+        help="Also export run metrics in Prometheus textfile-collector format to this path",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=("cpu", "memory"),
+        help="Profile the run with cProfile (cpu) or tracemalloc (memory)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=Path(".cache/profile.pstats"),
+        help="Where --profile cpu dumps its pstats file",
+    )
     parser.add_argument(
         "--keyword",
         dest="keywords",
         action="append",
         help="Only send jobs whose title contains this keyword (case-insensitive). "
-        "Specify multiple times for OR logic. Defaults to 'software,data engineer,data analyst'.",
+        "Specify multiple times for OR logic. "
+        "Defaults to every include term in the routing config.",
     )
     return parser
 
 
+class Runtime:
+    def __init__(self, args: argparse.Namespace, settings: Settings) -> None:
+        self.args = args
+        self.settings = settings
+        from jobbot.http_cache import ResponseCache
+        from jobbot.sources.workday import WorkdaySessionCache
+        from jobbot.transport import Transport
+
+        self.store: DedupeStore | ShardStore
+        outbox_path, rollups_path = args.outbox, args.rollups
+        if args.shard:
+            # Shards only read the canonical ledger; eviction and compaction happen on merge.
+            self.store = ShardStore(DedupeStore(args.store), *args.shard)
+            outbox_path = _shard_path(outbox_path, *args.shard)
+            rollups_path = _shard_path(rollups_path, *args.shard)
+        else:
+            self.store = DedupeStore(args.store, retention_days=args.retention_days or None)
+        self.outbox = Outbox(outbox_path)
+        self.rollups = Rollups(rollups_path)
+        # Posts acknowledged before a crash that never reached the ledger.
+        for uid, ts in self.outbox.acked.items():
+            self.store.add(uid, ts)
+        self._ack_lock = threading.Lock()
+        self.cache = None if args.no_http_cache else ResponseCache(args.http_cache)
+        self.sessions = WorkdaySessionCache(args.workday_sessions)
+        self.router = Router(settings.routing, keywords=args.keywords)
+        self.snapshots: BoardSnapshots | None = None
+        if not args.no_board_snapshots:
+            self.snapshots = BoardSnapshots(args.board_snapshots, self.router.digest())
+        self.rate_limiter = RateLimiter()
+        self.health = SourceHealth(args.source_health, settings.sources.health)
+        self.skipped: list[str] = []
+        self.results: list[SourceResult] = []
+        self.categories: dict[str, str] = {}
+        self.fetched = 0
+        self.poller: AdaptivePoller | None = None
+        if args.adaptive_polling:
+            self.poller = AdaptivePoller(
+                args.store.with_name("poll_state.json"), settings.sources.polling
+            )
+        self.transport = Transport(settings.sources.scrape)
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def keep_warm(self) -> None:
+        # The async pool is bound to one event loop, so the daemon keeps that loop too.
+        self.loop = asyncio.new_event_loop()
+
+    def scrape(self, since: date, keep: Prefilter | None = None) -> list[JobPosting]:
+        sources = self.settings.sources
+        refs = iter_sources(sources.greenhouse, sources.lever, sources.workday)
+        if self.args.shard:
+            index, count = self.args.shard
+            refs = select_shard(refs, index, count)
+            print(f"Shard {index}/{count} owns {len(refs)} sources")
+        if self.poller is not None:
+            due = self.poller.due(refs)
+            print(f"Polling {len(due)} of {len(refs)} sources due under adaptive intervals")
+            refs = due
+        refs, skipped = self.health.allow(refs)
+        self.skipped = [ref.key for ref in skipped]
+        if skipped:
+            METRICS.inc("source_skipped_total", len(skipped))
+            print(f"Skipping {len(skipped)} failing source(s) until their backoff expires")
+        if self.loop is not None or self.args.concurrent:
+            fetch = scrape_sources_async(
+                refs,
+                options=sources.scrape,
+                client=self.transport.async_client if self.loop is not None else None,
+                cache=self.cache,
+                since=since,
+                sessions=self.sessions,
+                keep=keep,
+                snapshots=self.snapshots,
+            )
+            if self.loop is not None:
+                results = self.loop.run_until_complete(fetch)
+            else:
+                results = asyncio.run(fetch)
+        else:
+            results = scrape_sources(
+                refs,
+                cache=self.cache,
+                since=since,
+                sessions=self.sessions,
+                keep=keep,
+                snapshots=self.snapshots,
+                client=self.transport.client,
+            )
+        for result in results:
+            if result.ok:
+                self.health.record_success(result.ref.key)
+                if self.poller is not None:
+                    key = result.ref.key
+                    # result.jobs is what survived the prefilter, so it says nothing about
+                    # whether the board moved; use the snapshot diff or the raw uids.
+                    changed = added = None
+                    if self.snapshots is not None:
+                        changed, added = self.snapshots.changed(key), self.snapshots.added(key)
+                    uids = keep.raw_uids(key) if keep and keep.track_uids else None
+                    self.poller.record(
+                        key, result.jobs, changed=changed, new_uids=added, uids=uids
+                    )
+                continue
+            backoff = self.health.record_failure(result.ref.key, result.error)
+            if backoff:
+                print(f"[health] Backing off {result.ref.key} for {backoff / 60:.0f} min")
+        self.results = results
+        return flatten(results)
+
+    def seen(self, uid: str) -> bool:
+        return self.store.has(uid) or uid in self.outbox
+
+    def acknowledge(self, jobs: list[JobPosting]) -> None:
+        # Called from the notifier threads after each webhook post Discord accepted.
+        with self._ack_lock:
+            channels = [self.outbox.channel(job.uid) for job in jobs]
+            ts = self.outbox.ack(jobs)
+            sent_at = datetime.fromisoformat(ts)
+            for job, channel in zip(jobs, channels):
+                self.store.add(job.uid, ts)
+                self.rollups.record(f"{job.provider}:{job.handle}", channel, sent_at, job.posted_at)
+
+    def record_run(self, started_at: datetime) -> None:
+        shard = "/".join(map(str, self.args.shard)) if self.args.shard else None
+        write_run(
+            self.args.run_log,
+            started_at,
+            self.results,
+            skipped=self.skipped,
+            categories=self.categories,
+            fetched=self.fetched,
+            shard=shard,
+            keywords=self.router.match_terms(),
+        )
+        prune_runs(self.args.run_log, RUN_LOG_DAYS)
+
+    def persist(self) -> None:
+        self.store.save()
+        self.rollups.save()
+        self.outbox.compact()
+
+    def flush(self) -> None:
+        with METRICS.timer("stage_seconds", stage="flush"):
+            if self.cache is not None:
+                self.cache.save()
+            self.sessions.save()
+            self.health.save()
+            if self.snapshots is not None:
+                self.snapshots.save()
+            if self.poller is not None:
+                self.poller.save()
+            self.persist()
+            self.store.maybe_compact()
+
+    def write_report(self, started_at: datetime, sent: int | None) -> None:
+        report = {
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "mode": "daemon" if self.args.daemon else "once",
+            "dry_run": self.args.dry_run,
+            "sent": sent,
+            "skipped_sources": self.skipped,
+            "source_health": self.health.report(),
+        }
+        METRICS.write_json(self.args.run_report, report)
+        if self.args.prometheus_textfile:
+            METRICS.write_prometheus(self.args.prometheus_textfile)
+
+    def close(self) -> None:
+        self.transport.close()
+        if self.loop is not None:
+            self.loop.run_until_complete(self.transport.aclose())
+            self.loop.close()
+
+
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
 
-    load_dotenv()
-    settings = load_settings(args.config)
-    store = DedupeStore(args.store)
-    jobs = scrape_all(
-        settings.sources.greenhouse, settings.sources.lever, settings.sources.workday
-    )
-    print(f"Fetched {len(jobs)} postings from configured sources")
+    timings = {"imports": _IMPORT_FINISHED - _IMPORT_STARTED}
+    started = time.perf_counter()
+    from dotenv import load_dotenv
 
-    new_jobs = [job for job in jobs if not store.has(job.uid)]
-    if not new_jobs:
-        print("No new jobs found")
-        return 0
-    default_keywords = sorted(set(SOFTWARE_KEYWORDS + DATA_KEYWORDS))
-    user_keywords = args.keywords if args.keywords else default_keywords
-    keywords = [kw.lower() for kw in user_keywords]
-    if keywords:
-        filtered_jobs = [job for job in new_jobs if _title_contains(job.title, keywords)]
-        print(f"{len(filtered_jobs)} of {len(new_jobs)} new postings matched keywords {keywords}")
+    load_dotenv()
+    timings["dotenv"] = time.perf_counter() - started
+    started = time.perf_counter()
+    if args.no_settings_snapshot:
+        settings, snapshot_hit = load_settings(args.config, routing_config=args.routing), False
     else:
-        filtered_jobs = new_jobs
+        settings, snapshot_hit = load_settings_cached(
+            args.config, routing_config=args.routing, snapshot_path=args.settings_snapshot
+        )
+    timings["settings"] = time.perf_counter() - started
+    started = time.perf_counter()
+    runtime = Runtime(args, settings)
+    timings["runtime"] = time.perf_counter() - started
+    if args.startup_profile:
+        _print_startup_profile(timings, snapshot_hit)
+    if args.profile:
+        return _run_profiled(args, lambda: _run(runtime))
+    return _run(runtime)
 
-    today = datetime.now(timezone.utc).date()
-    window_start = today - timedelta(days=1)
-    filtered_jobs = [job for job in filtered_jobs if _is_within_window(job, window_start, today)]
-    print(
-        f"{len(filtered_jobs)} postings remain after filtering to jobs posted between "
-        f"{window_start.isoformat()} and {today.isoformat()} (UTC)"
-    )
 
-    if not filtered_jobs:
-        print("No new jobs match the keyword filter")
+def _run(runtime: Runtime) -> int:
+    args = runtime.args
+    if not args.daemon:
+        started_at = datetime.now(timezone.utc)
+        sent = None
+        try:
+            sent = run_cycle(runtime)
+        finally:
+            runtime.flush()
+            runtime.write_report(started_at, sent)
+            runtime.close()
         return 0
 
-    data_jobs, software_jobs, other_jobs = _partition_jobs(filtered_jobs)
-    print(
-        f"Routing {len(software_jobs)} software jobs, {len(data_jobs)} data jobs, "
-        f"{len(other_jobs)} uncategorized jobs"
+    runtime.keep_warm()
+    scheduler = Scheduler(
+        lambda: _observed_cycle(runtime),
+        runtime.flush,
+        interval=args.interval,
+        flush_interval=args.flush_interval,
     )
+    scheduler.install_signal_handlers()
+    print(f"[daemon] Polling every {args.interval:g}s; press Ctrl+C to stop")
+    try:
+        scheduler.run()
+    finally:
+        runtime.close()
+    return 0
+
 
+def _observed_cycle(runtime: Runtime) -> int:
+    METRICS.reset()
+    started_at = datetime.now(timezone.utc)
+    sent = None
+    try:
+        sent = run_cycle(runtime)
+    finally:
+        runtime.write_report(started_at, sent)
+    return sent
+
+
+def run_cycle(runtime: Runtime) -> int:
+    snapshots = runtime.snapshots
+    started_at = datetime.now(timezone.utc)
+    runtime.results, runtime.categories, runtime.fetched = [], {}, 0
+    try:
+        sent = _run_cycle(runtime)
+    except BaseException:
+        if snapshots is not None:
+            snapshots.discard()
+        raise
+    if snapshots is not None:
+        snapshots.commit()
+    runtime.record_run(started_at)
+    return sent
+
+
+def _run_cycle(runtime: Runtime) -> int:
+    args = runtime.args
+    settings = runtime.settings
+    router = runtime.router
     sent_total = 0
-    stored_ids: set[str] = set()
-
-    def send_jobs(jobs: list[JobPosting], webhook: str | None, label: str) -> int:
-        if not jobs or not webhook:
-            if jobs:
-                print(f"No webhook configured for {label}; skipping {len(jobs)} jobs")
-            return 0
-        notifier = DiscordNotifier(str(webhook))
-        jobs.sort(key=lambda job: job.posted_at or datetime.min.replace(tzinfo=timezone.utc))
-        sent = notifier.send(jobs, dry_run=args.dry_run)
-        stored_ids.update(job.uid for job in jobs)
-        print(f"Sent {sent} {label} job(s) to Discord")
-        return sent
+    pending = runtime.outbox.by_channel()
+    if pending:
+        queued = sum(len(jobs) for jobs in pending.values())
+        print(f"Delivering {queued} job(s) left in the outbox by an earlier run")
+        sent_total += _deliver(runtime, pending)
 
-    sent_total += send_jobs(
-        data_jobs,
-        settings.discord_webhook_url_data or settings.discord_webhook_url,
-        "data",
+    window_start, today = posting_window()
+    # Dedupe, keyword and window checks run inside the sources on raw records, so only
+    # postings that survive all three are ever built.
+    prefilter = Prefilter(
+        runtime.seen, router, window_start, today, track_uids=runtime.poller is not None
     )
-    sent_total += send_jobs(
-        software_jobs,
-        settings.discord_webhook_url_software or settings.discord_webhook_url,
-        "software",
+    with METRICS.timer("stage_seconds", stage="scrape"):
+        jobs = runtime.scrape(window_start, keep=prefilter)
+    prefilter.record_metrics()
+    runtime.fetched = prefilter.total
+    print(f"Fetched {prefilter.total} postings from configured sources")
+
+    new_count = prefilter.kept_after("dedupe")
+    if not new_count:
+        print("No new jobs found")
+        return sent_total
+    keyword_desc = args.keywords or "from the routing config"
+    matched = prefilter.kept_after("keywords")
+    print(f"{matched} of {new_count} new postings matched keywords {keyword_desc}")
+    print(
+        f"{len(jobs)} postings remain after filtering to jobs posted between "
+        f"{window_start.isoformat()} and {today.isoformat()} (UTC)"
     )
-    sent_total += send_jobs(
-        other_jobs,
-        settings.discord_webhook_url,
-        "general",
+
+    if not jobs:
+        print("No new jobs match the keyword filter")
+        return sent_total
+
+    routed = [(job, router.route(job.title)) for job in jobs]
+    runtime.categories = {job.uid: route.category for job, route in routed}
+    by_category = _partition_jobs(routed, router)
+    print(
+        "Routing "
+        + ", ".join(f"{len(jobs)} {category} jobs" for category, jobs in by_category.items())
     )
 
+    queued_jobs: dict[str, list[JobPosting]] = {}
+    for category, category_jobs in by_category.items():
+        if not category_jobs:
+            continue
+        if not settings.webhook_for(router.webhook_for(category)):
+            print(f"No webhook configured for {category}; skipping {len(category_jobs)} jobs")
+            _retry_next_run(runtime, category_jobs)
+            continue
+        # Queue before posting so a crash or outage mid-send resumes from the outbox.
+        runtime.outbox.enqueue(category, category_jobs)
+        queued_jobs[category] = category_jobs
+
+    sent_total += _deliver(runtime, queued_jobs)
     if sent_total == 0:
         print("No jobs were sent to Discord")
         return 0
-
-    now_ts = datetime.now(timezone.utc).isoformat()
-    for job_id in stored_ids:
-        store.add(job_id, now_ts)
-    store.save()
     print(f"Notified Discord about {sent_total} jobs")
-    return 0
+    return sent_total
 
 
-def _title_contains(title: str, keywords: list[str]) -> bool:
-    haystack = (title or "").lower()
-    return any(keyword in haystack for keyword in keywords)
+def _deliver(runtime: Runtime, by_category: dict[str, list[JobPosting]]) -> int:
+    args = runtime.args
+    from jobbot.notifier import DiscordNotifier, send_all
 
+    deliveries: list[tuple[str, DiscordNotifier, list[JobPosting]]] = []
+    for category, category_jobs in by_category.items():
+        webhook = runtime.settings.webhook_for(runtime.router.webhook_for(category))
+        if not webhook:
+            print(f"No webhook configured for {category}; {len(category_jobs)} jobs stay queued")
+            continue
+        notifier = DiscordNotifier(
+            webhook,
+            batch_size=args.embeds_per_message,
+            rate_limiter=runtime.rate_limiter,
+            client=runtime.transport.client,
+            name=category,
+        )
+        category_jobs.sort(
+            key=lambda job: job.posted_at or datetime.min.replace(tzinfo=timezone.utc)
+        )
+        deliveries.append((category, notifier, category_jobs))
 
-def _is_within_window(job: "JobPosting", start_date, end_date) -> bool:
-    if not job.posted_at:
-        return False
-    dt = job.posted_at
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    else:
-        dt = dt.astimezone(timezone.utc)
-    job_date = dt.date()
-    return start_date <= job_date <= end_date
+    sent_total = 0
+    with METRICS.timer("stage_seconds", stage="notify"):
+        results = send_all(
+            [(notifier, jobs) for _, notifier, jobs in deliveries],
+            dry_run=args.dry_run,
+            on_sent=runtime.acknowledge,
+            on_rejected=runtime.outbox.reject,
+        )
+    for (label, _, jobs), sent in zip(deliveries, results):
+        if sent is None:
+            print(f"Failed to deliver {label} jobs; unsent ones stay queued for the next run")
+            continue
+        sent_total += sent
+        print(f"Sent {sent} {label} job(s) to Discord")
 
+    if sent_total:
+        with METRICS.timer("stage_seconds", stage="persist"):
+            runtime.persist()
+    return sent_total
 
-def _is_software_job(job: JobPosting) -> bool:
-    return _title_contains(job.title, [kw.lower() for kw in SOFTWARE_KEYWORDS])
 
+def _parse_shard(value: str) -> tuple[int, int]:
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {value!r}") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}")
+    return index, count
 
-def _is_data_job(job: JobPosting) -> bool:
-    return _title_contains(job.title, [kw.lower() for kw in DATA_KEYWORDS])
 
+def _shard_path(path: Path, index: int, count: int) -> Path:
+    return path.with_name(f"{path.stem}.shard-{index}-of-{count}{path.suffix}")
 
-def _partition_jobs(jobs: list[JobPosting]) -> tuple[list[JobPosting], list[JobPosting], list[JobPosting]]:
-    data_jobs: list[JobPosting] = []
-    software_jobs: list[JobPosting] = []
-    other_jobs: list[JobPosting] = []
-    for job in jobs:
-        if _is_data_job(job):
-            data_jobs.append(job)
-        elif _is_software_job(job):
-            software_jobs.append(job)
-        else:
-            other_jobs.append(job)
-    return data_jobs, software_jobs, other_jobs
+
+def _retry_next_run(runtime: Runtime, jobs: list[JobPosting]) -> None:
+    if runtime.snapshots is not None:
+        for job in jobs:
+            runtime.snapshots.forget(job)
+
+
+def _run_profiled(args: argparse.Namespace, run: Callable[[], int]) -> int:
+    if args.profile == "memory":
+        import tracemalloc
+
+        tracemalloc.start(25)
+        try:
+            return run()
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"[profile] Peak traced memory {peak / 1e6:.1f} MB; top allocations:")
+            for stat in snapshot.statistics("lineno")[:20]:
+                print(f"[profile]   {stat}")
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return run()
+    finally:
+        profiler.disable()
+        args.profile_output.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(args.profile_output)
+        print(f"[profile] Wrote {args.profile_output}; top functions by cumulative time:")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+
+
+def _print_startup_profile(timings: dict[str, float], snapshot_hit: bool) -> None:
+    # Module imports before main() runs (interpreter start, site) are not included;
+    # use `python -X importtime -m jobbot.main` for a per-module breakdown.
+    parts = [f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()]
+    snapshot = "hit" if snapshot_hit else "miss"
+    print(f"[startup] {', '.join(parts)} (settings snapshot {snapshot})")
+
+
+def _partition_jobs(
+    routed: list[tuple[JobPosting, Route]], router: Router
+) -> dict[str, list[JobPosting]]:
+    by_category: dict[str, list[JobPosting]] = {rule.name: [] for rule in router.categories}
+    by_category.setdefault(router.config.fallback, [])
+    for job, route in routed:
+        by_category.setdefault(route.category, []).append(job)
+    return by_category
 
 
 if __name__ == "__main__":
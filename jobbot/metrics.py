@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_SOURCE: ContextVar[str] = ContextVar("jobbot_source", default="unknown")
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.timers: Dict[str, Dict[LabelKey, list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            stats = self.timers.setdefault(name, {}).setdefault(key, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                name: [
+                    {"labels": dict(key), "value": value} for key, value in sorted(series.items())
+                ]
+                for name, series in sorted(self.counters.items())
+            }
+            timers = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "count": int(count),
+                        "total_seconds": round(total, 6),
+                        "max_seconds": round(peak, 6),
+                    }
+                    for key, (count, total, peak) in sorted(series.items())
+                ]
+                for name, series in sorted(self.timers.items())
+            }
+        return {"counters": counters, "timers": timers}
+
+    def write_json(self, path: Path, extra: dict | None = None) -> None:
+        payload = {**(extra or {}), **self.snapshot()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+
+    def write_prometheus(self, path: Path, prefix: str = "jobbot") -> None:
+        lines: list[str] = []
+        snapshot = self.snapshot()
+        for name, series in snapshot["counters"].items():
+            metric = _metric_name(prefix, name)
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{_labels(s['labels'])} {s['value']:g}" for s in series)
+        for name, series in snapshot["timers"].items():
+            metric = _metric_name(prefix, name)
+            lines.append(f"# TYPE {metric} summary")
+            for s in series:
+                labels = _labels(s["labels"])
+                lines.append(f"{metric}_count{labels} {s['count']}")
+                lines.append(f"{metric}_sum{labels} {s['total_seconds']:g}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so node_exporter never scrapes a half-written file.
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        tmp.replace(path)
+
+
+METRICS = Metrics()
+
+
+@contextmanager
+def source_context(key: str) -> Iterator[None]:
+    token = _SOURCE.set(key)
+    try:
+        yield
+    finally:
+        _SOURCE.reset(token)
+
+
+def current_source() -> str:
+    return _SOURCE.get()
+
+
+def record_response(response: "httpx.Response", *, kind: str = "jobs") -> None:
+    source = current_source()
+    METRICS.inc("http_responses_total", source=source, kind=kind, status=str(response.status_code))
+    METRICS.inc("http_bytes_total", len(response.content), source=source, kind=kind)
+    try:
+        elapsed = response.elapsed.total_seconds()
+    except RuntimeError:
+        return
+    METRICS.observe("fetch_seconds", elapsed, source=source, kind=kind)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{name}")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in sorted(labels.items()))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,16 +1,181 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from dataclasses import FrozenInstanceError
 from datetime import datetime
+from typing import Any, Callable, Iterable, List, Tuple
+
+_UNPARSED = object()
+
+# (job_id, title, company, location, url, raw_posted_at) as pulled out of a board payload.
+# Without a parse_posted callable the last item is taken to be a datetime already.
+RawPosting = Tuple[Any, str, "str | None", "str | None", str, Any]
+# keep(uid, title, raw_posted_at, parse_posted) decides whether a record becomes a JobPosting.
+Keep = Callable[[str, str, Any, "Callable[[Any], datetime | None] | None"], bool]
 
 
-@dataclass(frozen=True)
 class JobPosting:
-    uid: str
-    provider: str
-    handle: str
-    title: str
-    company: str
-    location: str | None
-    url: str
-    posted_at: datetime | None
+    __slots__ = (
+        "uid",
+        "provider",
+        "handle",
+        "title",
+        "company",
+        "location",
+        "url",
+        "_posted_at",
+        "_posted_raw",
+        "_parse_posted",
+    )
+
+    _FIELDS = ("uid", "provider", "handle", "title", "company", "location", "url", "posted_at")
+
+    def __init__(
+        self,
+        uid: str,
+        provider: str,
+        handle: str,
+        title: str,
+        company: str,
+        location: str | None,
+        url: str,
+        posted_at: datetime | None,
+    ) -> None:
+        setattr_ = object.__setattr__
+        setattr_(self, "uid", uid)
+        setattr_(self, "provider", _intern(provider))
+        setattr_(self, "handle", _intern(handle))
+        setattr_(self, "title", title)
+        setattr_(self, "company", _intern(company))
+        setattr_(self, "location", _intern(location))
+        setattr_(self, "url", url)
+        setattr_(self, "_posted_at", posted_at)
+        setattr_(self, "_posted_raw", None)
+        setattr_(self, "_parse_posted", None)
+
+    @classmethod
+    def lazy(
+        cls,
+        uid: str,
+        provider: str,
+        handle: str,
+        title: str,
+        company: str,
+        location: str | None,
+        url: str,
+        posted_raw: Any,
+        parse_posted: Callable[[Any], datetime | None],
+    ) -> "JobPosting":
+        job = cls(uid, provider, handle, title, company, location, url, None)
+        if posted_raw is not None:
+            object.__setattr__(job, "_posted_at", _UNPARSED)
+            object.__setattr__(job, "_posted_raw", posted_raw)
+            object.__setattr__(job, "_parse_posted", parse_posted)
+        return job
+
+    @classmethod
+    def bulk(
+        cls,
+        provider: str,
+        handle: str,
+        records: Iterable[RawPosting],
+        parse_posted: Callable[[Any], datetime | None] | None = None,
+        keep: Keep | None = None,
+    ) -> List["JobPosting"]:
+        provider = sys.intern(provider)
+        handle = sys.intern(handle)
+        prefix = f"{provider}:{handle}:"
+        new = cls.__new__
+        setattr_ = object.__setattr__
+        jobs: List[JobPosting] = []
+        for job_id, title, company, location, url, posted_raw in records:
+            uid = prefix + str(job_id)
+            if keep is not None and not keep(uid, title, posted_raw, parse_posted):
+                continue
+            job = new(cls)
+            setattr_(job, "uid", uid)
+            setattr_(job, "provider", provider)
+            setattr_(job, "handle", handle)
+            setattr_(job, "title", title)
+            setattr_(job, "company", _intern(company) or handle)
+            setattr_(job, "location", _intern(location))
+            setattr_(job, "url", url)
+            if posted_raw is None or parse_posted is None:
+                setattr_(job, "_posted_at", posted_raw)
+                setattr_(job, "_posted_raw", None)
+                setattr_(job, "_parse_posted", None)
+            else:
+                setattr_(job, "_posted_at", _UNPARSED)
+                setattr_(job, "_posted_raw", posted_raw)
+                setattr_(job, "_parse_posted", parse_posted)
+            jobs.append(job)
+        return jobs
+
+    @property
+    def posted_at(self) -> datetime | None:
+        value = self._posted_at
+        if value is _UNPARSED:
+            value = self._parse_posted(self._posted_raw)
+            object.__setattr__(self, "_posted_at", value)
+            object.__setattr__(self, "_posted_raw", None)
+            object.__setattr__(self, "_parse_posted", None)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def _astuple(self) -> tuple:
+        return (
+            self.uid,
+            self.provider,
+            self.handle,
+            self.title,
+            self.company,
+            self.location,
+            self.url,
+            self.posted_at,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __repr__(self) -> str:
+        values = zip(self._FIELDS, self._astuple())
+        fields = ", ".join(f"{name}={value!r}" for name, value in values)
+        return f"JobPosting({fields})"
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, self._astuple())
+
+    def to_dict(self) -> dict:
+        data = dict(zip(self._FIELDS, self._astuple()))
+        data["posted_at"] = self.posted_at.isoformat() if self.posted_at else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JobPosting":
+        return cls.lazy(
+            uid=data["uid"],
+            provider=data["provider"],
+            handle=data["handle"],
+            title=data["title"],
+            company=data["company"],
+            location=data.get("location"),
+            url=data["url"],
+            posted_raw=data.get("posted_at") or None,
+            parse_posted=datetime.fromisoformat,
+        )
+
+
+def _intern(value: str | None) -> str | None:
+    if value is None or value.__class__ is not str:
+        return value
+    return sys.intern(value)
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Iterable
+from typing import Callable, Iterable, Iterator, Sequence
 import time
 
 import httpx
 
+from jobbot.metrics import METRICS
 from jobbot.models import JobPosting
+from jobbot.ratelimit import RateLimiter
+from jobbot.transport import borrow_client
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+# Statuses that blame the payload. 401/403/404 blame the webhook, so the jobs stay queued.
+PAYLOAD_REJECTED = (400, 413)
+
+# Called with the jobs covered by each webhook post Discord accepted.
+OnSent = Callable[[list[JobPosting]], None]
+# Called with the jobs of a post Discord refused because of its payload (400 or 413).
+OnRejected = Callable[[list[JobPosting], int], None]
 
 
 class DiscordNotifier:
@@ -18,32 +32,114 @@ class DiscordNotifier:
         max_retries: int = 5,
         fallback_sleep: float = 2.0,
         per_message_delay: float = 0.5,
+        batch_size: int = 1,
+        rate_limiter: RateLimiter | None = None,
+        client: httpx.Client | None = None,
+        name: str = "default",
     ) -> None:
         self.webhook_url = webhook_url
+        self.name = name
         self.timeout = timeout
         self.max_retries = max_retries
         self.fallback_sleep = fallback_sleep
         self.per_message_delay = per_message_delay
+        self.batch_size = max(1, min(batch_size, MAX_EMBEDS_PER_MESSAGE))
+        self.bucket = rate_limiter.bucket(webhook_url) if rate_limiter else None
+        self.client = client
 
-    def send(self, jobs: Iterable[JobPosting], *, dry_run: bool = False) -> int:
-        count = 0
-        with httpx.Client(timeout=self.timeout) as client:
+    def send(
+        self,
+        jobs: Iterable[JobPosting],
+        *,
+        dry_run: bool = False,
+        on_sent: OnSent | None = None,
+        on_rejected: OnRejected | None = None,
+    ) -> int:
+        if dry_run:
+            jobs = list(jobs)
             for job in jobs:
-                if dry_run:
-                    print(f"[DRY RUN] Would notify Discord about {job.title} @ {job.company}")
-                    count += 1
-                    continue
-                payload = self._build_payload(job)
-                self._post_with_retry(client, payload)
-                if self.per_message_delay:
-                    time.sleep(self.per_message_delay)
-                count += 1
+                print(f"[DRY RUN] Would notify Discord about {job.title} @ {job.company}")
+            if on_sent is not None:
+                on_sent(jobs)
+            return len(jobs)
+        with borrow_client(self.client, timeout=self.timeout) as client:
+            return self._send_batches(client, jobs, on_sent, on_rejected)
+
+    def _send_batches(
+        self,
+        client: httpx.Client,
+        jobs: Iterable[JobPosting],
+        on_sent: OnSent | None = None,
+        on_rejected: OnRejected | None = None,
+    ) -> int:
+        jobs = list(jobs)
+        count = 0
+        for embeds in self._chunk_embeds(self._build_embed(job) for job in jobs):
+            # Chunks keep embed order, so each post covers the next len(embeds) jobs.
+            chunk = jobs[count : count + len(embeds)]
+            self._post_chunk(client, chunk, embeds, on_sent, on_rejected)
+            if self.per_message_delay and self.bucket is None:
+                time.sleep(self.per_message_delay)
+            METRICS.inc("notify_embeds_total", len(embeds), channel=self.name)
+            count += len(embeds)
         return count
 
+    def _post_chunk(
+        self,
+        client: httpx.Client,
+        jobs: list[JobPosting],
+        embeds: list[dict],
+        on_sent: OnSent | None,
+        on_rejected: OnRejected | None,
+    ) -> None:
+        try:
+            self._post_with_retry(client, {"content": None, "embeds": embeds})
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code if exc.response is not None else None
+            if status not in PAYLOAD_REJECTED:
+                raise
+            if len(embeds) == 1:
+                if on_rejected is not None:
+                    on_rejected(jobs, status)
+                raise
+            # One bad embed fails the whole message; resend them one at a time so only the
+            # job Discord refuses is charged with the rejection.
+            for job, embed in zip(jobs, embeds):
+                self._post_chunk(client, [job], [embed], on_sent, on_rejected)
+            return
+        if on_sent is not None:
+            on_sent(jobs)
+
+    def _chunk_embeds(self, embeds: Iterable[dict]) -> Iterator[list[dict]]:
+        chunk: list[dict] = []
+        chunk_chars = 0
+        for embed in embeds:
+            size = _embed_chars(embed)
+            if chunk and (
+                len(chunk) >= self.batch_size or chunk_chars + size > MAX_EMBED_CHARS_PER_MESSAGE
+            ):
+                yield chunk
+                chunk, chunk_chars = [], 0
+            chunk.append(embed)
+            chunk_chars += size
+        if chunk:
+            yield chunk
+
     def _post_with_retry(self, client: httpx.Client, payload: dict) -> None:
         last_response: httpx.Response | None = None
         for attempt in range(self.max_retries):
-            response = client.post(self.webhook_url, json=payload)
+            if attempt:
+                METRICS.inc("notify_retries_total", channel=self.name)
+            if self.bucket is not None:
+                with METRICS.timer("notify_wait_seconds", channel=self.name):
+                    self.bucket.acquire()
+            with METRICS.timer("notify_post_seconds", channel=self.name):
+                response = client.post(self.webhook_url, json=payload, timeout=self.timeout)
+            METRICS.inc(
+                "notify_responses_total", channel=self.name, status=str(response.status_code)
+            )
+            if self.bucket is not None:
+                self.bucket.update(response.headers)
             if response.status_code == 429:
                 retry_after = response.headers.get("Retry-After")
                 try:
@@ -51,7 +147,11 @@ class DiscordNotifier:
                 except (TypeError, ValueError):
                     sleep_for = self.fallback_sleep
                 sleep_for = max(sleep_for, self.fallback_sleep)
-                time.sleep(sleep_for)
+                if self.bucket is not None:
+                    self.bucket.block_for(sleep_for)
+                else:
+                    time.sleep(sleep_for)
+                    METRICS.observe("notify_wait_seconds", sleep_for, channel=self.name)
                 last_response = response
                 continue
             response.raise_for_status()
@@ -64,7 +164,7 @@ class DiscordNotifier:
             response=last_response,
         )
 
-    def _build_payload(self, job: JobPosting) -> dict:
+    def _build_embed(self, job: JobPosting) -> dict:
         timestamp = job.posted_at.isoformat() if job.posted_at else datetime.utcnow().isoformat()
         description_lines = [
             f"**Company:** {job.company}",
@@ -73,13 +173,39 @@ class DiscordNotifier:
             f"**Posted:** {timestamp}",
         ]
         return {
-            "content": None,
-            "embeds": [
-                {
-                    "title": job.title,
-                    "url": job.url,
-                    "description": "\n".join(description_lines),
-                    "color": 5814783,
-                }
-            ],
+            "title": job.title,
+            "url": job.url,
+            "description": "\n".join(description_lines),
+            "color": 5814783,
         }
+
+
+def send_all(
+    deliveries: Sequence[tuple[DiscordNotifier, Sequence[JobPosting]]],
+    *,
+    dry_run: bool = False,
+    on_sent: OnSent | None = None,
+    on_rejected: OnRejected | None = None,
+) -> list[int | None]:
+    if not deliveries:
+        return []
+    with ThreadPoolExecutor(max_workers=len(deliveries)) as pool:
+        futures = [
+            pool.submit(
+                notifier.send, jobs, dry_run=dry_run, on_sent=on_sent, on_rejected=on_rejected
+            )
+            for notifier, jobs in deliveries
+        ]
+    results: list[int | None] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except httpx.HTTPError as exc:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            print(f"[notifier] Giving up on webhook delivery ({type(exc).__name__} {status or ''})")
+            results.append(None)
+    return results
+
+
+def _embed_chars(embed: dict) -> int:
+    return len(embed.get("title") or "") + len(embed.get("description") or "")
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from jobbot.models import JobPosting
+
+MAX_ATTEMPTS = 3
+
+
+class Outbox:
+    def __init__(self, path: Path, *, max_attempts: int = MAX_ATTEMPTS) -> None:
+        self.path = path
+        self.schema = 1
+        self.max_attempts = max_attempts
+        self.pending: Dict[str, dict] = {}
+        self.acked: Dict[str, str] = {}
+        # Jobs Discord kept rejecting; they stay out of the queue but still count as seen.
+        self.dead: Dict[str, dict] = {}
+        self._stale = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        for line in self.path.read_text().splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-append; earlier lines are intact.
+                continue
+            if record.get("schema") != self.schema:
+                raise RuntimeError("Unsupported outbox schema")
+            if record["op"] == "add":
+                self.pending[record["uid"]] = record
+            elif record["op"] == "ack":
+                for uid in record["uids"]:
+                    if self.pending.pop(uid, None) is not None:
+                        self.acked[uid] = record["ts"]
+            elif record["op"] == "fail":
+                self._stale = True
+                for uid in record["uids"]:
+                    if uid in self.pending:
+                        self.pending[uid]["attempts"] = self.pending[uid].get("attempts", 0) + 1
+            elif record["op"] == "dead":
+                self.pending.pop(record["uid"], None)
+                self.dead[record["uid"]] = record
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self.pending or uid in self.acked or uid in self.dead
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def enqueue(self, channel: str, jobs: Iterable[JobPosting]) -> int:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            records = [
+                {
+                    "schema": self.schema,
+                    "op": "add",
+                    "uid": job.uid,
+                    "channel": channel,
+                    "queued_at": now,
+                    "job": job.to_dict(),
+                }
+                for job in jobs
+                if job.uid not in self
+            ]
+            self._append(records)
+            for record in records:
+                self.pending[record["uid"]] = record
+        return len(records)
+
+    def channel(self, uid: str) -> str | None:
+        record = self.pending.get(uid)
+        return record["channel"] if record else None
+
+    def ack(self, jobs: Iterable[JobPosting]) -> str:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            uids = [job.uid for job in jobs if job.uid in self.pending]
+            if uids:
+                self._append([{"schema": self.schema, "op": "ack", "uids": uids, "ts": now}])
+                for uid in uids:
+                    del self.pending[uid]
+                    self.acked[uid] = now
+        return now
+
+    def reject(self, jobs: Iterable[JobPosting], status: int) -> List[str]:
+        # Discord refused the job's payload (400/413). Jobs that keep getting refused are
+        # dead-lettered so they stop blocking the rest of their channel.
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            uids = [job.uid for job in jobs if job.uid in self.pending]
+            if not uids:
+                return []
+            dead: Dict[str, dict] = {}
+            for uid in uids:
+                record = self.pending[uid]
+                record["attempts"] = record.get("attempts", 0) + 1
+                if record["attempts"] >= self.max_attempts:
+                    dead[uid] = {
+                        "schema": self.schema,
+                        "op": "dead",
+                        "uid": uid,
+                        "channel": record["channel"],
+                        "status": status,
+                        "attempts": record["attempts"],
+                        "ts": now,
+                        "job": record["job"],
+                    }
+            fail = {"schema": self.schema, "op": "fail", "uids": uids, "status": status, "ts": now}
+            self._append([fail, *dead.values()])
+            self._stale = True
+            for uid, record in dead.items():
+                del self.pending[uid]
+                self.dead[uid] = record
+        for uid in dead:
+            print(f"[outbox] Dead-lettered {uid} after {self.max_attempts} rejected posts")
+        return list(dead)
+
+    def by_channel(self) -> Dict[str, List[JobPosting]]:
+        channels: Dict[str, List[JobPosting]] = {}
+        with self._lock:
+            for record in self.pending.values():
+                job = JobPosting.from_dict(record["job"])
+                channels.setdefault(record["channel"], []).append(job)
+        return channels
+
+    def compact(self) -> None:
+        # Only call once the ledger holding the acked uids has been saved.
+        with self._lock:
+            if not self.acked and not self._stale:
+                return
+            self.acked.clear()
+            self._stale = False
+            records = [*self.dead.values(), *self.pending.values()]
+            if not records:
+                self.path.unlink(missing_ok=True)
+                return
+            tmp = self.path.with_name(f"{self.path.name}.tmp")
+            tmp.write_text("".join(json.dumps(r) + "\n" for r in records))
+            tmp.replace(self.path)
+
+    def _append(self, records: List[dict]) -> None:
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as handle:
+            handle.write("".join(json.dumps(record) + "\n" for record in records))
+            handle.flush()
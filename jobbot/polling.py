@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence, Set
+
+from jobbot.config import PollingOptions
+from jobbot.filters import uid_hash
+from jobbot.models import JobPosting
+from jobbot.scraper import SourceRef
+
+
+class AdaptivePoller:
+    def __init__(self, path: Path, options: PollingOptions | None = None) -> None:
+        self.path = path
+        self.options = options or PollingOptions()
+        self.schema = 2
+        self.sources: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return
+        if data.get("schema") == self.schema:
+            self.sources = data.get("sources", {})
+
+    def due(self, refs: Sequence[SourceRef], now: datetime | None = None) -> List[SourceRef]:
+        now = now or datetime.now(timezone.utc)
+        due: List[SourceRef] = []
+        for ref in refs:
+            state = self.sources.get(ref.key)
+            if state is None or datetime.fromisoformat(state["next_poll_at"]) <= now:
+                due.append(ref)
+        return due
+
+    def record(
+        self,
+        key: str,
+        jobs: Sequence[JobPosting],
+        now: datetime | None = None,
+        changed: bool | None = None,
+        new_uids: int | None = None,
+        uids: Set[str] | None = None,
+    ) -> None:
+        now = now or datetime.now(timezone.utc)
+        options = self.options
+        state = self.sources.get(key)
+        # Callers that only see a delta (board snapshots) pass `changed` and `new_uids`, and
+        # callers whose jobs were filtered pass the hashed raw `uids`; otherwise the full
+        # job list is the board.
+        if changed is not None:
+            uids = None
+        elif uids is None:
+            uids = {uid_hash(job.uid) for job in jobs}
+        if state is None:
+            state = {
+                "interval": options.min_interval,
+                "polls": 0,
+                "changes": 0,
+                "new_uids": 0,
+                "change_rate": 1.0,
+            }
+            changed, new_uids = True, 0
+        else:
+            if changed is None:
+                previous = set(state.get("uids", []))
+                changed = uids != previous
+                new_uids = len(uids - previous)
+            # New ids are what the bot is polling for; edits and removals alone hold the
+            # interval rather than speeding it up.
+            if new_uids:
+                interval = state["interval"] * options.speedup
+            elif changed:
+                interval = state["interval"]
+            else:
+                interval = state["interval"] * options.backoff
+            state["interval"] = min(options.max_interval, max(options.min_interval, interval))
+        weight = options.smoothing
+        state["change_rate"] = weight * float(changed) + (1 - weight) * state["change_rate"]
+        state["polls"] += 1
+        state["changes"] += int(changed)
+        state["new_uids"] += new_uids or 0
+        if uids is not None:
+            state["uids"] = sorted(uids)
+        else:
+            state.pop("uids", None)
+        state["last_polled_at"] = now.isoformat()
+        state["next_poll_at"] = (now + timedelta(seconds=state["interval"])).isoformat()
+        self.sources[key] = state
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema": self.schema, "sources": self.sources}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        self._dirty = False
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Mapping
+
+
+class RateLimitBucket:
+    def __init__(self) -> None:
+        self.remaining: int | None = None
+        self.reset_at = 0.0
+        self.slept = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self.reset_at:
+                    self.remaining = None
+                if self.remaining is None or self.remaining > 0:
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    return
+                wait = self.reset_at - now
+            time.sleep(wait)
+            self.slept += wait
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        try:
+            remaining_value = int(remaining)
+            reset_at = time.monotonic() + float(reset_after)
+        except ValueError:
+            return
+        with self._lock:
+            self.remaining = remaining_value
+            self.reset_at = reset_at
+
+    def block_for(self, seconds: float) -> None:
+        with self._lock:
+            self.remaining = 0
+            self.reset_at = max(self.reset_at, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    def __init__(self) -> None:
+        self.buckets: Dict[str, RateLimitBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key: str) -> RateLimitBucket:
+        with self._lock:
+            if key not in self.buckets:
+                self.buckets[key] = RateLimitBucket()
+            return self.buckets[key]
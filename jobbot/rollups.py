@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from jobbot.store import DedupeStore
+
+Counters = Dict[str, dict]
+
+
+class Rollups:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.schema = 1
+        # day -> "provider:handle" -> counters; alerted counts the jobs with a posted_at.
+        self.days: Dict[str, Counters] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return
+        if data.get("schema") == self.schema:
+            self.days = data.get("days", {})
+
+    def record(
+        self,
+        source: str,
+        category: str | None,
+        sent_at: datetime,
+        posted_at: datetime | None = None,
+    ) -> None:
+        day = sent_at.astimezone(timezone.utc).date().isoformat()
+        counters = self.days.setdefault(day, {}).setdefault(source, _counters())
+        counters["sent"] += 1
+        if category:
+            counters["categories"][category] = counters["categories"].get(category, 0) + 1
+        if posted_at is not None:
+            if posted_at.tzinfo is None:
+                posted_at = posted_at.replace(tzinfo=timezone.utc)
+            counters["alerted"] += 1
+            counters["alert_seconds"] += max(0.0, (sent_at - posted_at).total_seconds())
+        self._dirty = True
+
+    def merge(self, other: "Rollups") -> None:
+        for day, sources in other.days.items():
+            for source, counters in sources.items():
+                mine = self.days.setdefault(day, {}).setdefault(source, _counters())
+                for name in ("sent", "alerted", "alert_seconds"):
+                    mine[name] += counters[name]
+                for category, count in counters["categories"].items():
+                    mine["categories"][category] = mine["categories"].get(category, 0) + count
+
+    def by_source(self, start: date, end: date) -> Counters:
+        totals: Counters = {}
+        for _, sources in self._between(start, end):
+            for source, counters in sources.items():
+                total = totals.setdefault(source, {"sent": 0, "alerted": 0, "alert_seconds": 0.0})
+                for name in ("sent", "alerted", "alert_seconds"):
+                    total[name] += counters[name]
+        return totals
+
+    def by_category(self, start: date, end: date) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for _, sources in self._between(start, end):
+            for counters in sources.values():
+                for category, count in counters["categories"].items():
+                    totals[category] = totals.get(category, 0) + count
+        return totals
+
+    def daily(self, start: date, end: date) -> List[Tuple[str, dict]]:
+        rows = []
+        for day, sources in self._between(start, end):
+            total = {"sent": 0, "alerted": 0, "alert_seconds": 0.0}
+            for counters in sources.values():
+                for name in total:
+                    total[name] += counters[name]
+            rows.append((day, total))
+        return rows
+
+    def _between(self, start: date, end: date) -> Iterable[Tuple[str, Counters]]:
+        first, last = start.isoformat(), end.isoformat()
+        return ((day, self.days[day]) for day in sorted(self.days) if first <= day <= last)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema": self.schema, "days": self.days}
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")))
+        tmp.replace(self.path)
+        self._dirty = False
+
+
+def _counters() -> dict:
+    return {"sent": 0, "alerted": 0, "alert_seconds": 0.0, "categories": {}}
+
+
+def shard_rollup_paths(path: Path) -> List[Path]:
+    return sorted(path.parent.glob(f"{path.stem}.shard-*-of-*.json"))
+
+
+def load_rollups(path: Path) -> Rollups:
+    rollups = Rollups(path)
+    for shard_path in shard_rollup_paths(path):
+        rollups.merge(Rollups(shard_path))
+    return rollups
+
+
+def rebuild_from_ledger(store: DedupeStore, rollups: Rollups) -> int:
+    # The ledger only keeps uid -> sent timestamp, so a rebuild restores the sent
+    # counters but not categories or time-to-alert.
+    rollups.days = {}
+    for uid, ts in store.entries.items():
+        provider, handle, _ = uid.split(":", 2)
+        rollups.record(f"{provider}:{handle}", None, datetime.fromisoformat(ts))
+    return len(store.entries)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Maintain the sent-job rollups")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--store", type=Path, default=Path("data/sent_jobs.json"))
+    parser.add_argument("--rollups", type=Path, default=Path("data/rollups.json"))
+    args = parser.parse_args()
+    rollups = Rollups(args.rollups)
+    count = rebuild_from_ledger(DedupeStore(args.store), rollups)
+    rollups.save()
+    print(f"Rebuilt {rollups.path} from {count} ledger entries")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
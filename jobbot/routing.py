@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Set
+
+from jobbot.config import CategoryRule, RoutingConfig
+
+FILTER_CATEGORY = "__keywords__"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over lowercase terms.
+
+    ``find`` walks a title once and reports every term that occurs in it, including
+    overlapping ones, in O(len(title) + matches) regardless of the number of terms.
+    """
+
+    def __init__(self, terms: Sequence[tuple[str, bool]]) -> None:
+        self.terms = [term for term, _ in terms]
+        self.bounded = [bounded for _, bounded in terms]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for index, term in enumerate(self.terms):
+            self._insert(term, index)
+        self._link()
+
+    def _insert(self, term: str, index: int) -> None:
+        state = 0
+        for char in term:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(index)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                if self.bounded[index] and not _at_boundary(text, end, len(self.terms[index])):
+                    continue
+                found.add(index)
+        return found
+
+
+@dataclass(frozen=True)
+class Route:
+    matched_keywords: bool
+    category: str
+
+
+class Router:
+    def __init__(self, config: RoutingConfig, keywords: Iterable[str] | None = None) -> None:
+        self.config = config
+        self.categories: List[CategoryRule] = list(config.categories)
+        self.keywords = sorted({keyword.lower() for keyword in keywords or []})
+        self.filter_enabled = keywords is not None
+        terms: List[tuple[str, bool]] = []
+        owners: List[tuple[str, bool]] = []
+        for rule in self.categories:
+            for term in rule.include:
+                terms.append((term.lower(), rule.word_boundary))
+                owners.append((rule.name, True))
+            for term in rule.exclude:
+                terms.append((term.lower(), rule.word_boundary))
+                owners.append((rule.name, False))
+        for keyword in keywords or []:
+            terms.append((keyword.lower(), False))
+            owners.append((FILTER_CATEGORY, True))
+        self._owners = owners
+        self._automaton = KeywordAutomaton(terms)
+
+    def route(self, title: str | None) -> Route:
+        included: Set[str] = set()
+        excluded: Set[str] = set()
+        for index in self._automaton.find((title or "").lower()):
+            name, include = self._owners[index]
+            (included if include else excluded).add(name)
+        claimed = [
+            rule.name
+            for rule in self.categories
+            if rule.name in included and rule.name not in excluded
+        ]
+        if self.filter_enabled:
+            matched = FILTER_CATEGORY in included
+        else:
+            # Without --keyword, a title matches only if some category still claims it
+            # after that category's excludes.
+            matched = bool(claimed)
+        return Route(matched, claimed[0] if claimed else self.config.fallback)
+
+    def match_terms(self) -> List[str]:
+        if self.filter_enabled:
+            return list(self.keywords)
+        return [term for rule in self.categories for term in rule.include]
+
+    def digest(self) -> str:
+        # Identifies which titles this router matches; webhooks do not affect it.
+        rules = [rule.model_dump(exclude={"webhook"}) for rule in self.categories]
+        payload = {"rules": rules, "keywords": self.keywords if self.filter_enabled else None}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def webhook_for(self, category: str) -> str:
+        for rule in self.categories:
+            if rule.name == category:
+                return rule.webhook or rule.name
+        return self.config.fallback
+
+
+def _at_boundary(text: str, end: int, length: int) -> bool:
+    start = end - length + 1
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end + 1 < len(text) and text[end + 1].isalnum():
+        return False
+    return True
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
+
+from jobbot.models import JobPosting
+
+if TYPE_CHECKING:
+    from jobbot.scraper import SourceResult
+
+SCHEMA = 1
+
+
+@dataclass
+class RunLog:
+    path: Path
+    started_at: datetime
+    finished_at: datetime | None = None
+    shard: str | None = None
+    fetched: int = 0
+    keywords: List[str] = field(default_factory=list)
+    sources: List[dict] = field(default_factory=list)
+    jobs: List[Tuple[JobPosting, str]] = field(default_factory=list)
+
+
+def run_log_path(directory: Path, started_at: datetime, shard: str | None = None) -> Path:
+    stem = started_at.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    if shard:
+        stem += ".shard-" + shard.replace("/", "-of-")
+    return directory / f"{stem}.jsonl"
+
+
+def write_run(
+    directory: Path,
+    started_at: datetime,
+    results: Sequence[SourceResult],
+    *,
+    skipped: Iterable[str] = (),
+    categories: Dict[str, str] | None = None,
+    fetched: int = 0,
+    shard: str | None = None,
+    keywords: Sequence[str] = (),
+) -> Path:
+    categories = categories or {}
+    lines = [
+        {
+            "type": "run",
+            "schema": SCHEMA,
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "shard": shard,
+            "fetched": fetched,
+            "keywords": list(keywords),
+        }
+    ]
+    for result in results:
+        lines.append(
+            {
+                "type": "source",
+                "source": result.ref.key,
+                "jobs": len(result.jobs),
+                "error": result.error,
+            }
+        )
+    lines.extend({"type": "source", "source": key, "skipped": True} for key in skipped)
+    for result in results:
+        for job in result.jobs:
+            lines.append(
+                {"type": "job", "category": categories.get(job.uid), **job.to_dict()}
+            )
+    path = run_log_path(directory, started_at, shard)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text("".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines))
+    tmp.replace(path)
+    return path
+
+
+def read_run(path: Path) -> RunLog:
+    run: RunLog | None = None
+    for line in path.read_text().splitlines():
+        record = json.loads(line)
+        kind = record.pop("type")
+        if kind == "run":
+            if record.get("schema") != SCHEMA:
+                raise RuntimeError(f"Unsupported run log schema in {path}")
+            run = RunLog(
+                path=path,
+                started_at=datetime.fromisoformat(record["started_at"]),
+                finished_at=datetime.fromisoformat(record["finished_at"]),
+                shard=record.get("shard"),
+                fetched=record.get("fetched", 0),
+                keywords=record.get("keywords", []),
+            )
+        elif kind == "source":
+            run.sources.append(record)
+        elif kind == "job":
+            category = record.pop("category")
+            run.jobs.append((JobPosting.from_dict(record), category))
+    if run is None:
+        raise RuntimeError(f"Run log {path} has no header")
+    return run
+
+
+def read_runs(directory: Path, since: datetime | None = None) -> List[RunLog]:
+    if not directory.exists():
+        return []
+    paths = sorted(directory.glob("*.jsonl"))
+    if since is not None:
+        # File names start with the UTC start time, so older runs are skipped unread.
+        first = run_log_path(directory, since).name
+        paths = [path for path in paths if path.name >= first]
+    return [read_run(path) for path in paths]
+
+
+def prune_runs(directory: Path, keep_days: int) -> int:
+    if not directory.exists():
+        return 0
+    cutoff = run_log_path(directory, datetime.now(timezone.utc) - timedelta(days=keep_days))
+    expired = [path for path in directory.glob("*.jsonl") if path.name < cutoff.name]
+    for path in expired:
+        path.unlink()
+    return len(expired)
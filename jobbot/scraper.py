@@ -1,29 +1,200 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence
 
-from jobbot.config import WorkdaySource
-from jobbot.models import JobPosting
-from jobbot.sources import greenhouse, lever, workday
+from jobbot.config import LeverSource, ScrapeOptions, WorkdaySource
+from jobbot.metrics import METRICS, source_context
+from jobbot.models import JobPosting, Keep
+from jobbot.sources import get_connector
 
+if TYPE_CHECKING:
+    import httpx
 
-def scrape_all(
+    from jobbot.http_cache import ResponseCache
+    from jobbot.snapshots import BoardSnapshots
+    from jobbot.sources.workday import WorkdaySessionCache
+
+HOSTS = {
+    "greenhouse": "boards-api.greenhouse.io",
+    "lever": "api.lever.co",
+}
+
+
+@dataclass(frozen=True)
+class SourceRef:
+    provider: str
+    handle: str
+    workday: WorkdaySource | None = None
+    lever: LeverSource | None = None
+
+    @property
+    def key(self) -> str:
+        if self.workday is not None:
+            return f"workday:{self.workday.tenant}:{self.workday.site}"
+        return f"{self.provider}:{self.handle}"
+
+    @property
+    def host(self) -> str:
+        if self.workday is not None:
+            return self.workday.host
+        return HOSTS[self.provider]
+
+
+def iter_sources(
     greenhouse_handles: Iterable[str],
-    lever_handles: Iterable[str],
+    lever_handles: Iterable[str | LeverSource],
     workday_sources: Iterable[WorkdaySource] | None = None,
-) -> List[JobPosting]:
-    jobs: List[JobPosting] = []
+) -> List[SourceRef]:
+    refs: List[SourceRef] = []
     for handle in greenhouse_handles:
         handle = handle.strip()
-        if not handle:
-            continue
-        jobs.extend(greenhouse.fetch_jobs(handle))
-    for handle in lever_handles:
-        handle = handle.strip()
-        if not handle:
-            continue
-        jobs.extend(lever.fetch_jobs(handle))
-    if workday_sources:
-        for source in workday_sources:
-            jobs.extend(workday.fetch_jobs(source))
+        if handle:
+            refs.append(SourceRef("greenhouse", handle))
+    for entry in lever_handles:
+        source = LeverSource(handle=entry) if isinstance(entry, str) else entry
+        handle = source.handle.strip()
+        if handle:
+            refs.append(SourceRef("lever", handle, lever=source))
+    for source in workday_sources or []:
+        refs.append(SourceRef("workday", source.tenant, source))
+    return refs
+
+
+def shard_of(ref: SourceRef, count: int) -> int:
+    # Hash provider:handle rather than ref.key so every Workday site of a tenant shares a
+    # shard; job uids are namespaced the same way, so shards never emit the same uid.
+    digest = hashlib.blake2b(f"{ref.provider}:{ref.handle}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def select_shard(refs: Sequence[SourceRef], index: int, count: int) -> List[SourceRef]:
+    return [ref for ref in refs if shard_of(ref, count) == index]
+
+
+@dataclass
+class SourceResult:
+    ref: SourceRef
+    jobs: List[JobPosting]
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def scrape_sources(
+    refs: Sequence[SourceRef],
+    *,
+    cache: ResponseCache | None = None,
+    since: date | None = None,
+    sessions: WorkdaySessionCache | None = None,
+    keep: Keep | None = None,
+    snapshots: BoardSnapshots | None = None,
+    client: httpx.Client | None = None,
+) -> List[SourceResult]:
+    results: List[SourceResult] = []
+    for ref in refs:
+        connector = get_connector(ref.provider)
+        with source_context(ref.key), METRICS.timer("source_seconds", source=ref.key):
+            try:
+                if ref.workday is not None:
+                    jobs = connector.fetch_jobs(
+                        ref.workday, since=since, sessions=sessions, keep=keep, client=client
+                    )
+                else:
+                    jobs = connector.fetch_jobs(
+                        ref.lever or ref.handle,
+                        cache=cache,
+                        keep=keep,
+                        snapshots=snapshots,
+                        client=client,
+                    )
+            except Exception as exc:  # noqa: BLE001
+                METRICS.inc("source_errors_total", source=ref.key)
+                print(f"[scraper] Failed to fetch {ref.key}: {exc!r}")
+                results.append(SourceResult(ref, [], repr(exc)))
+                continue
+        METRICS.inc("source_jobs_total", len(jobs), source=ref.key)
+        results.append(SourceResult(ref, jobs))
+    return results
+
+
+async def scrape_sources_async(
+    refs: Sequence[SourceRef],
+    *,
+    options: ScrapeOptions | None = None,
+    client: httpx.AsyncClient | None = None,
+    cache: ResponseCache | None = None,
+    since: date | None = None,
+    sessions: WorkdaySessionCache | None = None,
+    keep: Keep | None = None,
+    snapshots: BoardSnapshots | None = None,
+) -> List[SourceResult]:
+    options = options or ScrapeOptions()
+    global_limit = asyncio.Semaphore(options.max_concurrency)
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def host_limit(host: str) -> asyncio.Semaphore:
+        if host not in host_limits:
+            limit = options.host_limits.get(host, options.default_host_limit)
+            host_limits[host] = asyncio.Semaphore(limit)
+        return host_limits[host]
+
+    async def run(ref: SourceRef, http: httpx.AsyncClient) -> SourceResult:
+        async with global_limit, host_limit(ref.host):
+            with source_context(ref.key), METRICS.timer("source_seconds", source=ref.key):
+                try:
+                    jobs = await asyncio.wait_for(
+                        _fetch_async(ref, http, cache, since, sessions, keep, snapshots),
+                        options.timeout,
+                    )
+                except asyncio.TimeoutError:
+                    error = f"timed out after {options.timeout:.0f}s"
+                except Exception as exc:  # noqa: BLE001
+                    error = repr(exc)
+                else:
+                    METRICS.inc("source_jobs_total", len(jobs), source=ref.key)
+                    return SourceResult(ref, jobs)
+        METRICS.inc("source_errors_total", source=ref.key)
+        print(f"[scraper] Failed to fetch {ref.key}: {error}")
+        return SourceResult(ref, [], error)
+
+    async def gather(http: httpx.AsyncClient) -> List[SourceResult]:
+        return list(await asyncio.gather(*(run(ref, http) for ref in refs)))
+
+    if client is not None:
+        return await gather(client)
+    from jobbot.transport import build_async_client
+
+    async with build_async_client(options) as http:
+        return await gather(http)
+
+
+def flatten(results: Iterable[SourceResult]) -> List[JobPosting]:
+    jobs: List[JobPosting] = []
+    for result in results:
+        jobs.extend(result.jobs)
     return jobs
+
+
+async def _fetch_async(
+    ref: SourceRef,
+    client: httpx.AsyncClient,
+    cache: ResponseCache | None,
+    since: date | None,
+    sessions: WorkdaySessionCache | None,
+    keep: Keep | None = None,
+    snapshots: BoardSnapshots | None = None,
+) -> List[JobPosting]:
+    connector = get_connector(ref.provider)
+    if ref.workday is not None:
+        return await connector.fetch_jobs_async(
+            ref.workday, client, since=since, sessions=sessions, keep=keep
+        )
+    return await connector.fetch_jobs_async(
+        ref.lever or ref.handle, client, cache=cache, keep=keep, snapshots=snapshots
+    )
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from jobbot.metrics import METRICS
+from jobbot.models import JobPosting, RawPosting
+
+
+class BoardSnapshots:
+    def __init__(self, path: Path, filter_key: str | None = None) -> None:
+        self.path = path
+        self.schema = 1
+        # Records the prefilter dropped are still marked as seen, so the snapshot is only
+        # valid for the routing/keyword filter that produced it.
+        self.filter_key = filter_key
+        self.boards: Dict[str, dict] = {}
+        self._staged: Dict[str, dict] = {}
+        self._changed: Dict[str, bool] = {}
+        self._added: Dict[str, int] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return
+        if data.get("schema") != self.schema:
+            return
+        if data.get("filter") != self.filter_key:
+            print("[snapshots] Routing or keywords changed; re-reading every board in full")
+            self._dirty = True
+            return
+        self.boards = data.get("boards", {})
+
+    def unchanged(self, key: str, digest: str | None) -> bool:
+        board = self.boards.get(key)
+        if board is None or digest is None or digest != board["hash"]:
+            return False
+        self._changed[key] = False
+        self._added[key] = 0
+        METRICS.inc("board_unchanged_total", source=key)
+        return True
+
+    def delta(self, key: str, digest: str | None, records: List[RawPosting]) -> List[RawPosting]:
+        diff = self.diff(key)
+        changed = diff.filter(records)
+        diff.finish(digest)
+        return changed
+
+    def diff(self, key: str) -> BoardDiff:
+        return BoardDiff(self, key)
+
+    def _stage(self, key: str, digest: str | None, versions: Dict[str, Any], changed: int) -> None:
+        previous = (self.boards.get(key) or {}).get("ids", {})
+        self._staged[key] = {"hash": digest, "ids": versions}
+        self._changed[key] = bool(changed) or versions.keys() != previous.keys()
+        self._added[key] = len(versions.keys() - previous.keys())
+        METRICS.inc("board_delta_records_total", changed, source=key)
+
+    def changed(self, key: str) -> bool | None:
+        return self._changed.get(key)
+
+    def added(self, key: str) -> int | None:
+        return self._added.get(key)
+
+    def forget(self, job: JobPosting) -> None:
+        key = f"{job.provider}:{job.handle}"
+        job_id = job.uid[len(key) + 1 :]
+        for boards in (self._staged, self.boards):
+            board = boards.get(key)
+            if board is not None:
+                # Dropping the hash forces a full diff next time; dropping the id makes the
+                # job show up as added again.
+                board["hash"] = None
+                board["ids"].pop(job_id, None)
+                self._dirty = True
+
+    def commit(self) -> None:
+        if self._staged:
+            self.boards.update(self._staged)
+            self._dirty = True
+        self._staged.clear()
+        self._changed.clear()
+        self._added.clear()
+
+    def discard(self) -> None:
+        self._staged.clear()
+        self._changed.clear()
+        self._added.clear()
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema": self.schema, "filter": self.filter_key, "boards": self.boards}
+        self.path.write_text(json.dumps(payload, separators=(",", ":")))
+        self._dirty = False
+
+
+class BoardDiff:
+    # Diffs a board page by page, keeping only ids and versions until the board is staged.
+    def __init__(self, snapshots: BoardSnapshots, key: str) -> None:
+        self.snapshots = snapshots
+        self.key = key
+        self.previous: Dict[str, Any] = (snapshots.boards.get(key) or {}).get("ids", {})
+        self.versions: Dict[str, Any] = {}
+        self.changed = 0
+
+    def filter(self, records: List[RawPosting]) -> List[RawPosting]:
+        previous = self.previous
+        changed = []
+        for record in records:
+            job_id = str(record[0])
+            self.versions[job_id] = record[5]
+            if job_id not in previous or previous[job_id] != record[5]:
+                changed.append(record)
+        self.changed += len(changed)
+        return changed
+
+    def finish(self, digest: str | None) -> None:
+        self.snapshots._stage(self.key, digest, self.versions, self.changed)
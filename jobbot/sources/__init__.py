@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Dict
+
+CONNECTORS: Dict[str, str] = {
+    "greenhouse": "jobbot.sources.greenhouse",
+    "lever": "jobbot.sources.lever",
+    "workday": "jobbot.sources.workday",
+}
+
+
+def get_connector(provider: str) -> ModuleType:
+    try:
+        module_name = CONNECTORS[provider]
+    except KeyError:
+        raise RuntimeError(f"No connector registered for provider {provider!r}") from None
+    return importlib.import_module(module_name)
@@ -1,37 +1,74 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, List
 
 import httpx
 
-from jobbot.models import JobPosting
+from jobbot.http_cache import ResponseCache, parse_response
+from jobbot.models import JobPosting, Keep, RawPosting
+from jobbot.transport import borrow_client
+
+if TYPE_CHECKING:
+    from jobbot.snapshots import BoardSnapshots
 
 API_TEMPLATE = "https://boards-api.greenhouse.io/v1/boards/{handle}/jobs"
+HEADERS = {"User-Agent": "job-discord-bot/1.0"}
+# Per request, since a shared client carries the scrape-wide default.
+TIMEOUT = 20.0
+
+
+def fetch_jobs(
+    handle: str,
+    *,
+    cache: ResponseCache | None = None,
+    keep: Keep | None = None,
+    snapshots: BoardSnapshots | None = None,
+    client: httpx.Client | None = None,
+) -> List[JobPosting]:
+    url = API_TEMPLATE.format(handle=handle)
+    headers = {**HEADERS, **(cache.request_headers(url) if cache else {})}
+    with borrow_client(client, timeout=TIMEOUT) as client:
+        response = client.get(url, headers=headers, timeout=TIMEOUT)
+    records = parse_response(
+        url, response, extract_records, cache, snapshots, board=f"greenhouse:{handle}"
+    )
+    return JobPosting.bulk("greenhouse", handle, records, _parse_dt, keep)
 
 
-def fetch_jobs(handle: str) -> List[JobPosting]:
+async def fetch_jobs_async(
+    handle: str,
+    client: httpx.AsyncClient,
+    *,
+    cache: ResponseCache | None = None,
+    keep: Keep | None = None,
+    snapshots: BoardSnapshots | None = None,
+) -> List[JobPosting]:
     url = API_TEMPLATE.format(handle=handle)
-    with httpx.Client(timeout=20.0, headers={"User-Agent": "job-discord-bot/1.0"}) as client:
-        response = client.get(url)
-        response.raise_for_status()
-        payload = response.json()
-    jobs: List[JobPosting] = []
-    for job in payload.get("jobs", []):
-        job_id = f"greenhouse:{handle}:{job.get('id')}"
-        jobs.append(
-            JobPosting(
-                uid=job_id,
-                provider="greenhouse",
-                handle=handle,
-                title=job.get("title", "Unknown role"),
-                company=(job.get("company") or {}).get("name") or handle,
-                location=(job.get("location") or {}).get("name"),
-                url=job.get("absolute_url"),
-                posted_at=_parse_dt(job.get("updated_at") or job.get("created_at")),
-            )
+    headers = {**HEADERS, **(cache.request_headers(url) if cache else {})}
+    response = await client.get(url, headers=headers, timeout=TIMEOUT)
+    records = parse_response(
+        url, response, extract_records, cache, snapshots, board=f"greenhouse:{handle}"
+    )
+    return JobPosting.bulk("greenhouse", handle, records, _parse_dt, keep)
+
+
+def parse_jobs(handle: str, payload: dict, keep: Keep | None = None) -> List[JobPosting]:
+    return JobPosting.bulk("greenhouse", handle, extract_records(payload), _parse_dt, keep)
+
+
+def extract_records(payload: dict) -> List[RawPosting]:
+    return [
+        (
+            job.get("id"),
+            job.get("title", "Unknown role"),
+            (job.get("company") or {}).get("name"),
+            (job.get("location") or {}).get("name"),
+            job.get("absolute_url"),
+            job.get("updated_at") or job.get("created_at"),
         )
-    return jobs
+        for job in payload.get("jobs", [])
+    ]
 
 
 def _parse_dt(value: str | None) -> datetime | None:
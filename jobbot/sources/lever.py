@@ -1,37 +1,177 @@
 from __future__ import annotations
 
+import hashlib
 from datetime import datetime, timezone
-from typing import List
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, List, Optional, Tuple
 
 import httpx
 
-from jobbot.models import JobPosting
+from jobbot.config import LeverSource
+from jobbot.http_cache import ResponseCache, parse_response, response_digest
+from jobbot.models import JobPosting, Keep, RawPosting
+from jobbot.transport import borrow_client
 
-API_TEMPLATE = "https://api.lever.co/v0/postings/{handle}?mode=json"
+if TYPE_CHECKING:
+    from jobbot.snapshots import BoardSnapshots
 
+API_TEMPLATE = "https://api.lever.co/v0/postings/{handle}"
+HEADERS = {"User-Agent": "job-discord-bot/1.0"}
+# Per request, since a shared client carries the scrape-wide default.
+TIMEOUT = 20.0
+FILTERS = ("team", "department", "location", "commitment")
 
-def fetch_jobs(handle: str) -> List[JobPosting]:
-    url = API_TEMPLATE.format(handle=handle)
-    with httpx.Client(timeout=20.0, headers={"User-Agent": "job-discord-bot/1.0"}) as client:
-        response = client.get(url)
-        response.raise_for_status()
-        payload = response.json()
-    jobs: List[JobPosting] = []
+Page = Tuple[List[RawPosting], Optional[str]]
+
+
+def fetch_jobs(
+    source: LeverSource | str,
+    *,
+    cache: ResponseCache | None = None,
+    keep: Keep | None = None,
+    snapshots: BoardSnapshots | None = None,
+    client: httpx.Client | None = None,
+) -> List[JobPosting]:
+    source = _as_source(source)
+    board = _Board(source, keep, snapshots)
+    with borrow_client(client, timeout=TIMEOUT) as client:
+        for records, digest in iter_pages(client, source, cache):
+            board.add(records, digest)
+    return board.finish()
+
+
+async def fetch_jobs_async(
+    source: LeverSource | str,
+    client: httpx.AsyncClient,
+    *,
+    cache: ResponseCache | None = None,
+    keep: Keep | None = None,
+    snapshots: BoardSnapshots | None = None,
+) -> List[JobPosting]:
+    source = _as_source(source)
+    board = _Board(source, keep, snapshots)
+    async for records, digest in iter_pages_async(client, source, cache):
+        board.add(records, digest)
+    return board.finish()
+
+
+def iter_pages(
+    client: httpx.Client, source: LeverSource, cache: ResponseCache | None = None
+) -> Iterator[Page]:
+    pager = _Pager(source)
+    while pager.skip is not None:
+        url = page_url(source, pager.skip)
+        headers = {**HEADERS, **(cache.request_headers(url) if cache else {})}
+        response = client.get(url, headers=headers, timeout=TIMEOUT)
+        records = parse_response(url, response, extract_records, cache)
+        digest = response_digest(url, response, cache)
+        if pager.advance(records, digest):
+            yield records, digest
+
+
+async def iter_pages_async(
+    client: httpx.AsyncClient, source: LeverSource, cache: ResponseCache | None = None
+) -> AsyncIterator[Page]:
+    pager = _Pager(source)
+    while pager.skip is not None:
+        url = page_url(source, pager.skip)
+        headers = {**HEADERS, **(cache.request_headers(url) if cache else {})}
+        response = await client.get(url, headers=headers, timeout=TIMEOUT)
+        records = parse_response(url, response, extract_records, cache)
+        digest = response_digest(url, response, cache)
+        if pager.advance(records, digest):
+            yield records, digest
+
+
+class _Pager:
+    def __init__(self, source: LeverSource) -> None:
+        self.source = source
+        self.skip: int | None = 0
+        self._last: tuple | None = None
+
+    def advance(self, records: List[RawPosting], digest: str | None) -> bool:
+        # Returns whether the page is new; sets skip to None once paging should stop.
+        ids = [record[0] for record in records]
+        if self._last is not None and records and (
+            ids == self._last[0] or (digest is not None and digest == self._last[1])
+        ):
+            # The server ignored skip/limit and served the same page again.
+            self.skip = None
+            return False
+        self._last = (ids, digest)
+        next_skip = self.skip + self.source.page_size
+        # A longer page means the server ignored skip/limit and sent the whole board.
+        if len(records) != self.source.page_size or next_skip >= self.source.max_postings:
+            self.skip = None
+        else:
+            self.skip = next_skip
+        return True
+
+
+def page_url(source: LeverSource, skip: int) -> str:
+    params: List[Tuple[str, str | int]] = [
+        ("mode", "json"),
+        ("skip", skip),
+        ("limit", source.page_size),
+    ]
+    for name in FILTERS:
+        params.extend((name, value) for value in getattr(source, name))
+    return str(httpx.URL(API_TEMPLATE.format(handle=source.handle), params=params))
+
+
+def parse_jobs(handle: str, payload: list, keep: Keep | None = None) -> List[JobPosting]:
+    return JobPosting.bulk("lever", handle, extract_records(payload), _parse_ms, keep)
+
+
+def extract_records(payload: list) -> List[RawPosting]:
+    records: List[RawPosting] = []
     for job in payload:
-        job_id = f"lever:{handle}:{job.get('id')}"
-        jobs.append(
-            JobPosting(
-                uid=job_id,
-                provider="lever",
-                handle=handle,
-                title=job.get("text", "Unknown role"),
-                company=(job.get("categories") or {}).get("team") or handle,
-                location=(job.get("categories") or {}).get("location"),
-                url=job.get("hostedUrl"),
-                posted_at=_parse_ms(job.get("createdAt")),
+        categories = job.get("categories") or {}
+        records.append(
+            (
+                job.get("id"),
+                job.get("text", "Unknown role"),
+                categories.get("team"),
+                categories.get("location"),
+                job.get("hostedUrl"),
+                job.get("createdAt") or None,
             )
         )
-    return jobs
+    return records
+
+
+class _Board:
+    # Builds postings page by page; only ids and versions are kept for the snapshot diff.
+    def __init__(
+        self, source: LeverSource, keep: Keep | None, snapshots: BoardSnapshots | None
+    ) -> None:
+        self.source = source
+        self.keep = keep
+        self.key = f"lever:{source.handle}"
+        self.snapshots = snapshots
+        self.diff = snapshots.diff(self.key) if snapshots is not None else None
+        self.digest = hashlib.sha256()
+        self.jobs: List[JobPosting] = []
+
+    def add(self, records: List[RawPosting], digest: str | None) -> None:
+        self.digest.update((digest or "-").encode())
+        if self.diff is not None:
+            records = self.diff.filter(records)
+        self.jobs.extend(
+            JobPosting.bulk("lever", self.source.handle, records, _parse_ms, self.keep)
+        )
+
+    def finish(self) -> List[JobPosting]:
+        if self.snapshots is None:
+            return self.jobs
+        digest = self.digest.hexdigest()
+        if self.snapshots.unchanged(self.key, digest):
+            return []
+        self.diff.finish(digest)
+        return self.jobs
+
+
+def _as_source(source: LeverSource | str) -> LeverSource:
+    return LeverSource(handle=source) if isinstance(source, str) else source
 
 
 def _parse_ms(value):
@@ -1,80 +1,356 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import re
-from datetime import datetime, timedelta, timezone
-from typing import List
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List
 
 import httpx
 
 from jobbot.config import WorkdaySource
-from jobbot.models import JobPosting
+from jobbot.metrics import METRICS, current_source, record_response
+from jobbot.models import JobPosting, Keep, RawPosting
+from jobbot.transport import borrow_client
 
 POSTED_REGEX = re.compile(r"posted\s+(\d+)\s+day", re.IGNORECASE)
 CSRF_REGEX = re.compile(r'"csrfToken":"([^"]+)"')
+CLIENT_HEADERS = {
+    "User-Agent": "job-discord-bot/1.2",
+    "Accept": "text/html,application/xhtml+xml",
+}
+# Per request, since a shared client carries the scrape-wide default.
+TIMEOUT = 20.0
 
 
-def fetch_jobs(config: WorkdaySource) -> List[JobPosting]:
-    client_headers = {
-        "User-Agent": "job-discord-bot/1.2",
-        "Accept": "text/html,application/xhtml+xml",
-    }
-    with httpx.Client(timeout=20, headers=client_headers, follow_redirects=True) as client:
-        token = _bootstrap_session(client, config)
-        payload = {
-            "appliedFacets": config.applied_facets or {},
-            "limit": config.limit,
-            "offset": 0,
-            "searchText": config.search_text or "",
-        }
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
+class SessionExpired(Exception):
+    pass
+
+
+class WorkdaySessionCache:
+    def __init__(self, path: Path, *, ttl: timedelta = timedelta(hours=6)) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.schema = 1
+        self.sessions: Dict[str, dict] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return
+        if data.get("schema") == self.schema:
+            self.sessions = data.get("sessions", {})
+
+    def get(self, config: WorkdaySource) -> dict | None:
+        session = self.sessions.get(_session_key(config))
+        if not session:
+            return None
+        expires_at = datetime.fromisoformat(session["expires_at"])
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        return session
+
+    def put(self, config: WorkdaySource, token: str | None, cookies: httpx.Cookies) -> None:
+        self.sessions[_session_key(config)] = {
+            "token": token,
+            "cookies": [
+                {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+                for c in cookies.jar
+                if config.host.endswith(c.domain.lstrip("."))
+            ],
+            "expires_at": (datetime.now(timezone.utc) + self.ttl).isoformat(),
         }
-        if token:
-            headers["wd-csrf-token"] = token
+        self._dirty = True
+
+    def invalidate(self, config: WorkdaySource) -> None:
+        if self.sessions.pop(_session_key(config), None) is not None:
+            self._dirty = True
+
+    def lock(self, config: WorkdaySource) -> asyncio.Lock:
+        return self._locks.setdefault(_session_key(config), asyncio.Lock())
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema": self.schema, "sessions": self.sessions}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        self._dirty = False
+
+
+def fetch_jobs(
+    config: WorkdaySource,
+    *,
+    since: date | None = None,
+    sessions: WorkdaySessionCache | None = None,
+    keep: Keep | None = None,
+    client: httpx.Client | None = None,
+) -> List[JobPosting]:
+    with borrow_client(client, timeout=TIMEOUT) as client:
+        token, reused = _open_session(client, config, sessions)
+        try:
+            return _collect(iter_pages(client, config, token, since=since, keep=keep))
+        except SessionExpired:
+            if not reused:
+                raise
+        sessions.invalidate(config)
+        token, _ = _open_session(client, config, sessions)
+        return _collect(iter_pages(client, config, token, since=since, keep=keep))
+
+
+async def fetch_jobs_async(
+    config: WorkdaySource,
+    client: httpx.AsyncClient,
+    *,
+    since: date | None = None,
+    sessions: WorkdaySessionCache | None = None,
+    keep: Keep | None = None,
+) -> List[JobPosting]:
+    token, reused = await _open_session_async(client, config, sessions)
+    try:
+        return await _collect_async(iter_pages_async(client, config, token, since=since, keep=keep))
+    except SessionExpired:
+        if not reused:
+            raise
+    sessions.invalidate(config)
+    token, _ = await _open_session_async(client, config, sessions)
+    return await _collect_async(iter_pages_async(client, config, token, since=since, keep=keep))
+
+
+def iter_pages(
+    client: httpx.Client,
+    config: WorkdaySource,
+    token: str | None,
+    *,
+    since: date | None = None,
+    keep: Keep | None = None,
+) -> Iterator[List[JobPosting]]:
+    offset = 0
+    while True:
         try:
             response = client.post(
-                f"https://{config.host}/wday/cxs/{config.tenant}/{config.site}/jobs",
-                json=payload,
-                headers=headers,
+                _jobs_url(config),
+                json=_search_payload(config, offset),
+                headers=_api_headers(token),
+                timeout=TIMEOUT,
             )
+            record_response(response)
             response.raise_for_status()
         except httpx.HTTPStatusError as exc:
-            print(f"[workday] Failed to fetch {config.tenant}: {exc}")
-            return []
-        data = response.json()
+            if exc.response.status_code in (401, 403):
+                raise SessionExpired(str(exc)) from exc
+            if offset == 0:
+                raise
+            print(f"[workday] Failed to fetch {config.tenant} at offset {offset}: {exc}")
+            return
+        with METRICS.timer("parse_seconds", source=current_source()):
+            data = response.json()
+            records = extract_records(config, data)
+        yield JobPosting.bulk("workday", config.tenant, records, keep=keep)
+        offset += config.limit
+        if _is_last_page(config, data, offset, since, records):
+            return
 
-    jobs: List[JobPosting] = []
+
+async def iter_pages_async(
+    client: httpx.AsyncClient,
+    config: WorkdaySource,
+    token: str | None,
+    *,
+    since: date | None = None,
+    keep: Keep | None = None,
+) -> AsyncIterator[List[JobPosting]]:
+    offset = 0
+    while True:
+        try:
+            response = await client.post(
+                _jobs_url(config),
+                json=_search_payload(config, offset),
+                headers=_api_headers(token),
+                timeout=TIMEOUT,
+            )
+            record_response(response)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (401, 403):
+                raise SessionExpired(str(exc)) from exc
+            if offset == 0:
+                raise
+            print(f"[workday] Failed to fetch {config.tenant} at offset {offset}: {exc}")
+            return
+        with METRICS.timer("parse_seconds", source=current_source()):
+            data = response.json()
+            records = extract_records(config, data)
+        yield JobPosting.bulk("workday", config.tenant, records, keep=keep)
+        offset += config.limit
+        if _is_last_page(config, data, offset, since, records):
+            return
+
+
+def parse_jobs(config: WorkdaySource, data: dict, keep: Keep | None = None) -> List[JobPosting]:
+    return JobPosting.bulk("workday", config.tenant, extract_records(config, data), keep=keep)
+
+
+def extract_records(config: WorkdaySource, data: dict) -> List[RawPosting]:
+    records: List[RawPosting] = []
     for posting in data.get("jobPostings", []):
         external_path = posting.get("externalPath")
         if not external_path:
             continue
         job_id = posting.get("bulletFields", [external_path])
         job_id_str = job_id[0] if isinstance(job_id, list) else external_path
-        job_url = f"https://{config.host}{external_path}"
-        jobs.append(
-            JobPosting(
-                uid=f"workday:{config.tenant}:{job_id_str}",
-                provider="workday",
-                handle=config.tenant,
-                title=posting.get("title", "Unknown role"),
-                company=config.tenant,
-                location=posting.get("locationsText"),
-                url=job_url,
-                posted_at=_parse_posted_on(posting.get("postedOn")),
+        records.append(
+            (
+                job_id_str,
+                posting.get("title", "Unknown role"),
+                config.tenant,
+                posting.get("locationsText"),
+                f"https://{config.host}{external_path}",
+                # "Posted Today" is relative to fetch time, so it cannot be parsed lazily.
+                _parse_posted_on(posting.get("postedOn")),
             )
         )
+    return records
+
+
+def _jobs_url(config: WorkdaySource) -> str:
+    return f"https://{config.host}/wday/cxs/{config.tenant}/{config.site}/jobs"
+
+
+def _is_last_page(
+    config: WorkdaySource,
+    data: dict,
+    next_offset: int,
+    since: date | None,
+    records: List[RawPosting],
+) -> bool:
+    raw_count = len(data.get("jobPostings") or [])
+    if raw_count < config.limit:
+        return True
+    total = data.get("total")
+    if isinstance(total, int) and total and next_offset >= total:
+        return True
+    if next_offset >= config.max_postings:
+        return True
+    if since is not None:
+        # Results come back newest-first, so once the oldest posting on a page
+        # predates the window every later page does too.
+        dated = [record[5] for record in records if record[5] is not None]
+        if dated and min(dated).astimezone(timezone.utc).date() < since:
+            return True
+    return False
+
+
+def _search_payload(config: WorkdaySource, offset: int = 0) -> dict:
+    return {
+        "appliedFacets": config.applied_facets or {},
+        "limit": config.limit,
+        "offset": offset,
+        "searchText": config.search_text or "",
+    }
+
+
+def _api_headers(token: str | None) -> dict[str, str]:
+    headers = {
+        "User-Agent": CLIENT_HEADERS["User-Agent"],
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+    if token:
+        headers["wd-csrf-token"] = token
+    return headers
+
+
+def _open_session(
+    client: httpx.Client, config: WorkdaySource, sessions: WorkdaySessionCache | None
+) -> tuple[str | None, bool]:
+    cached = sessions.get(config) if sessions else None
+    if cached is not None:
+        _restore_cookies(client.cookies, cached)
+        return cached["token"], True
+    token = _bootstrap_session(client, config)
+    if sessions is not None and token:
+        sessions.put(config, token, client.cookies)
+    return token, False
+
+
+async def _open_session_async(
+    client: httpx.AsyncClient, config: WorkdaySource, sessions: WorkdaySessionCache | None
+) -> tuple[str | None, bool]:
+    if sessions is None:
+        return await _bootstrap_session_async(client, config), False
+    async with sessions.lock(config):
+        cached = sessions.get(config)
+        if cached is not None:
+            _restore_cookies(client.cookies, cached)
+            return cached["token"], True
+        token = await _bootstrap_session_async(client, config)
+        if token:
+            sessions.put(config, token, client.cookies)
+        return token, False
+
+
+def _restore_cookies(jar: httpx.Cookies, session: dict) -> None:
+    for cookie in session.get("cookies", []):
+        jar.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+
+
+def _collect(pages: Iterator[List[JobPosting]]) -> List[JobPosting]:
+    jobs: List[JobPosting] = []
+    for page in pages:
+        jobs.extend(page)
+    return jobs
+
+
+async def _collect_async(pages: AsyncIterator[List[JobPosting]]) -> List[JobPosting]:
+    jobs: List[JobPosting] = []
+    async for page in pages:
+        jobs.extend(page)
     return jobs
 
 
+def _session_key(config: WorkdaySource) -> str:
+    return f"{config.host}|{config.tenant}|{config.site}"
+
+
 def _bootstrap_session(client: httpx.Client, config: WorkdaySource) -> str | None:
-    bootstrap_url = f"https://{config.host}/{config.locale}/{config.site}"
     try:
-        resp = client.get(bootstrap_url)
+        resp = client.get(
+            _bootstrap_url(config), headers=CLIENT_HEADERS, follow_redirects=True, timeout=TIMEOUT
+        )
+        record_response(resp, kind="bootstrap")
         resp.raise_for_status()
     except httpx.HTTPError as exc:
         print(f"[workday] Bootstrap failed for {config.tenant}: {exc}")
         return None
+    return _extract_token(resp)
+
+
+async def _bootstrap_session_async(client: httpx.AsyncClient, config: WorkdaySource) -> str | None:
+    try:
+        resp = await client.get(
+            _bootstrap_url(config), headers=CLIENT_HEADERS, follow_redirects=True, timeout=TIMEOUT
+        )
+        record_response(resp, kind="bootstrap")
+        resp.raise_for_status()
+    except httpx.HTTPError as exc:
+        print(f"[workday] Bootstrap failed for {config.tenant}: {exc}")
+        return None
+    return _extract_token(resp)
+
+
+def _bootstrap_url(config: WorkdaySource) -> str:
+    return f"https://{config.host}/{config.locale}/{config.site}"
+
+
+def _extract_token(resp: httpx.Response) -> str | None:
     cookie_token = resp.cookies.get("CALYPSO_CSRF_TOKEN")
     if cookie_token:
         return cookie_token
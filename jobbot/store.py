@@ -1,40 +1,302 @@
 from __future__ import annotations
 
+import argparse
 import json
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple
+
+from jobbot.bloom import BloomFilter, hash_pair
 
 
 class DedupeStore:
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_segments: int = 30,
+        retention_days: int | None = None,
+        evict_every_days: int = 7,
+        bloom_generations: int = 52,
+        bloom_error_rate: float = 0.001,
+    ) -> None:
         self.path = path
         self.schema = 1
+        self.segment_dir = path.with_name(f"{path.stem}.segments")
+        # One immutable filter per eviction batch; the single-file filter of older
+        # versions is still read as the oldest generation.
+        self.bloom_dir = path.with_name(f"{path.stem}.blooms")
+        self.legacy_bloom_path = path.with_name(f"{path.stem}.bloom")
+        self.max_segments = max_segments
+        self.retention_days = retention_days
+        self.evict_every_days = evict_every_days
+        self.bloom_generations = bloom_generations
+        self.bloom_error_rate = bloom_error_rate
         self.entries: Dict[str, str] = {}
+        self.blooms: List[Tuple[Path, BloomFilter]] = []
+        self._pending: Dict[str, str] = {}
         self._load()
 
     def _load(self) -> None:
         if not self.path.exists():
             self.path.parent.mkdir(parents=True, exist_ok=True)
             self._persist()
+        else:
+            try:
+                data = json.loads(self.path.read_text())
+            except json.JSONDecodeError:
+                data = {"schema": self.schema, "jobs": {}}
+                self.path.write_text(json.dumps(data, indent=2, sort_keys=True))
+            if data.get("schema") != self.schema:
+                raise RuntimeError("Unsupported store schema")
+            self.entries = data.get("jobs", {})
+        for segment in self.segments():
+            self.entries.update(_read_segment(segment))
+        self.blooms = [(path, BloomFilter.load(path)) for path in self.bloom_paths()]
+
+    def bloom_paths(self) -> List[Path]:
+        paths = [self.legacy_bloom_path] if self.legacy_bloom_path.exists() else []
+        if self.bloom_dir.exists():
+            paths.extend(sorted(self.bloom_dir.glob("*.bloom")))
+        return paths
+
+    def has(self, job_id: str) -> bool:
+        if job_id in self.entries:
+            return True
+        if not self.blooms:
+            return False
+        h1, h2 = hash_pair(job_id)
+        return any(bloom.contains_hashes(h1, h2) for _, bloom in self.blooms)
+
+    def add(self, job_id: str, timestamp: str) -> None:
+        self.entries[job_id] = timestamp
+        self._pending[job_id] = timestamp
+
+    def save(self) -> None:
+        self._append_pending()
+        if self.retention_days is None or not self.entries:
             return
-        try:
-            data = json.loads(self.path.read_text())
-        except json.JSONDecodeError:
-            data = {"schema": self.schema, "jobs": {}}
-            self.path.write_text(json.dumps(data, indent=2, sort_keys=True))
+        cutoff = datetime.now(timezone.utc).date() - timedelta(days=self.retention_days)
+        # Evict in batches: wait until the oldest entry is a full batch past the cutoff, so
+        # the base file and a new filter are written about once a week rather than daily.
+        oldest = min(ts[:10] for ts in self.entries.values())
+        if oldest < (cutoff - timedelta(days=self.evict_every_days)).isoformat():
+            self.evict(cutoff)
+
+    def evict(self, cutoff: date) -> int:
+        cutoff_day = cutoff.isoformat()
+        expired = [uid for uid, ts in self.entries.items() if ts[:10] < cutoff_day]
+        if not expired:
+            return 0
+        # Each generation is sized for exactly its batch, and the error budget is split
+        # across the generations, so the combined rate stays within bloom_error_rate.
+        bloom = BloomFilter.for_capacity(
+            len(expired), self.bloom_error_rate / self.bloom_generations
+        )
+        for uid in expired:
+            bloom.add(uid)
+            del self.entries[uid]
+        self.bloom_dir.mkdir(parents=True, exist_ok=True)
+        path = self.bloom_dir / f"{cutoff_day}.bloom"
+        suffix = 1
+        while path.exists():
+            path = self.bloom_dir / f"{cutoff_day}.{suffix}.bloom"
+            suffix += 1
+        bloom.save(path)
+        self.blooms.append((path, bloom))
+        self._retire_blooms()
+        if not self.compact():
+            self._persist()
+        return len(expired)
+
+    def _retire_blooms(self) -> None:
+        # Drop the oldest generations past the limit, and any filter filled beyond its
+        # capacity (only the legacy single filter can be). Jobs that old are outside the
+        # posting window anyway.
+        keep = []
+        for path, bloom in self.blooms:
+            if bloom.false_positive_rate() > self.bloom_error_rate:
+                path.unlink()
+            else:
+                keep.append((path, bloom))
+        while len(keep) > self.bloom_generations:
+            path, _ = keep.pop(0)
+            path.unlink()
+        self.blooms = keep
+
+    def _append_pending(self) -> None:
+        if not self._pending:
+            return
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        segment = self.segment_dir / f"{datetime.now(timezone.utc).date().isoformat()}.jsonl"
+        lines = "".join(
+            json.dumps({"uid": uid, "ts": ts}) + "\n" for uid, ts in sorted(self._pending.items())
+        )
+        with segment.open("a") as handle:
+            handle.write(lines)
+        self._pending.clear()
+
+    def segments(self) -> List[Path]:
+        if not self.segment_dir.exists():
+            return []
+        return sorted(self.segment_dir.glob("*.jsonl"))
+
+    def compact(self, before: date | None = None) -> int:
+        self._append_pending()
+        folded = [
+            segment
+            for segment in self.segments()
+            if before is None or segment.stem < before.isoformat()
+        ]
+        if not folded:
+            return 0
+        remaining = [segment for segment in self.segments() if segment not in folded]
+        # Write the new base before deleting anything, so a crash or a full disk in
+        # between leaves every uid in either the old base or a segment.
+        self._persist(self._base_entries(remaining))
+        for segment in folded:
+            segment.unlink()
+        return len(folded)
+
+    def _base_entries(self, segments: List[Path]) -> Dict[str, str]:
+        base = dict(self.entries)
+        for segment in segments:
+            for uid in _read_segment(segment):
+                base.pop(uid, None)
+        return base
+
+    def maybe_compact(self) -> int:
+        if len(self.segments()) <= self.max_segments:
+            return 0
+        return self.compact(before=datetime.now(timezone.utc).date())
+
+    def _persist(self, jobs: Dict[str, str] | None = None) -> None:
+        payload = {"schema": self.schema, "jobs": self.entries if jobs is None else jobs}
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        tmp.replace(self.path)
+
+
+class ShardStore:
+    def __init__(self, ledger: DedupeStore, index: int, count: int) -> None:
+        self.ledger = ledger
+        self.shard = f"{index}/{count}"
+        self.path = shard_delta_path(ledger.path, index, count)
+        self.schema = 1
+        self.entries: Dict[str, str] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        data = json.loads(self.path.read_text())
         if data.get("schema") != self.schema:
-            raise RuntimeError("Unsupported store schema")
+            raise RuntimeError("Unsupported shard delta schema")
         self.entries = data.get("jobs", {})
 
     def has(self, job_id: str) -> bool:
-        return job_id in self.entries
+        return job_id in self.entries or self.ledger.has(job_id)
 
     def add(self, job_id: str, timestamp: str) -> None:
         self.entries[job_id] = timestamp
+        self._dirty = True
 
     def save(self) -> None:
-        self._persist()
-
-    def _persist(self) -> None:
-        payload = {"schema": self.schema, "jobs": self.entries}
+        if not self._dirty:
+            return
+        payload = {"schema": self.schema, "shard": self.shard, "jobs": self.entries}
         self.path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        self._dirty = False
+
+    def maybe_compact(self) -> int:
+        return 0
+
+
+def shard_delta_path(store_path: Path, index: int, count: int) -> Path:
+    return store_path.with_name(f"{store_path.stem}.shard-{index}-of-{count}.json")
+
+
+def find_shard_deltas(store_path: Path) -> List[Path]:
+    return sorted(store_path.parent.glob(f"{store_path.stem}.shard-*-of-*.json"))
+
+
+def merge_deltas(store: DedupeStore, deltas: List[Path]) -> int:
+    merged: Dict[str, str] = {}
+    for delta in deltas:
+        data = json.loads(delta.read_text())
+        if data.get("schema") != 1:
+            raise RuntimeError(f"Unsupported shard delta schema in {delta}")
+        for uid, ts in data.get("jobs", {}).items():
+            # Keep the earliest timestamp so the result is independent of delta order.
+            if uid not in merged or ts < merged[uid]:
+                merged[uid] = ts
+    added = 0
+    for uid in sorted(merged):
+        if not store.has(uid):
+            store.add(uid, merged[uid])
+            added += 1
+    store.save()
+    return added
+
+
+def _read_segment(segment: Path) -> Dict[str, str]:
+    entries: Dict[str, str] = {}
+    for line in segment.read_text().splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A torn final line from an interrupted append; earlier lines are intact.
+            continue
+        entries[record["uid"]] = record["ts"]
+    return entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Maintain the dedupe store")
+    parser.add_argument("command", choices=["compact", "merge"])
+    parser.add_argument("--store", type=Path, default=Path("data/sent_jobs.json"))
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Fold every segment, including today's, into the base file",
+    )
+    parser.add_argument(
+        "deltas",
+        nargs="*",
+        type=Path,
+        help="Shard deltas to merge (default: every <store>.shard-*-of-*.json next to the store)",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=30,
+        help="On merge, demote ledger entries older than this many days into the Bloom filter "
+        "(0 disables eviction), as a regular run would",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep shard delta files after merging them into the ledger",
+    )
+    args = parser.parse_args()
+    if args.command == "merge":
+        # Shard runs never evict or compact the ledger, so the merge does it for them.
+        store = DedupeStore(args.store, retention_days=args.retention_days or None)
+        deltas = sorted(args.deltas) if args.deltas else find_shard_deltas(args.store)
+        added = merge_deltas(store, deltas)
+        store.maybe_compact()
+        if not args.keep:
+            for delta in deltas:
+                delta.unlink()
+        print(f"Merged {len(deltas)} shard delta(s) into {store.path}; {added} new job(s)")
+        return 0
+    store = DedupeStore(args.store)
+    before = None if args.all else datetime.now(timezone.utc).date()
+    folded = store.compact(before=before)
+    print(f"Compacted {folded} segment(s) into {store.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator
+
+import httpx
+
+from jobbot.config import ScrapeOptions
+
+try:
+    import h2  # noqa: F401
+except ImportError:
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+
+def client_limits(options: ScrapeOptions) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=options.max_concurrency,
+        max_keepalive_connections=options.max_concurrency,
+        keepalive_expiry=options.keepalive_expiry,
+    )
+
+
+def build_client(
+    options: ScrapeOptions | None = None, *, timeout: float | None = None
+) -> httpx.Client:
+    options = options or ScrapeOptions()
+    return httpx.Client(
+        http2=options.http2 and HTTP2_AVAILABLE,
+        timeout=timeout or options.timeout,
+        limits=client_limits(options),
+        follow_redirects=True,
+    )
+
+
+def build_async_client(
+    options: ScrapeOptions | None = None, *, timeout: float | None = None
+) -> httpx.AsyncClient:
+    options = options or ScrapeOptions()
+    return httpx.AsyncClient(
+        http2=options.http2 and HTTP2_AVAILABLE,
+        timeout=timeout or options.timeout,
+        limits=client_limits(options),
+        follow_redirects=True,
+    )
+
+
+@contextmanager
+def borrow_client(
+    client: httpx.Client | None, *, timeout: float | None = None
+) -> Iterator[httpx.Client]:
+    if client is not None:
+        yield client
+        return
+    with build_client(timeout=timeout) as owned:
+        yield owned
+
+
+class Transport:
+    def __init__(self, options: ScrapeOptions | None = None) -> None:
+        self.options = options or ScrapeOptions()
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = build_client(self.options)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = build_async_client(self.options)
+        return self._async_client
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -1,76 +1,156 @@
 from __future__ import annotations
 
+import argparse
+import sys
 from collections import Counter
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Iterable
-
-import sys
-
-from dotenv import load_dotenv
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from jobbot.config import load_settings
+from jobbot.filters import is_within_window, posting_window
 from jobbot.models import JobPosting
-from jobbot.scraper import scrape_all
+from jobbot.rollups import Rollups, load_rollups
+from jobbot.runs import RunLog, read_runs
 
-DEFAULT_KEYWORDS = ["software", "data engineer", "data analyst"]
+RUN_LOG_DIR = Path(".cache/runs")
+ROLLUPS_PATH = Path("data/rollups.json")
 REPORT_PATH = Path("reports/latest.md")
+TREND_SOURCES = 15
 
 
-def title_contains(title: str, keywords: Iterable[str]) -> bool:
-    haystack = (title or "").lower()
-    return any(keyword in haystack for keyword in keywords)
+def collect_matches(runs: list[RunLog]) -> list[tuple[JobPosting, str]]:
+    # Every run logs only the postings it saw for the first time, so the window's
+    # matches are the union of the runs inside it.
+    window_start, today = posting_window()
+    matches: dict[str, tuple[JobPosting, str]] = {}
+    for run in runs:
+        for job, category in run.jobs:
+            if is_within_window(job.posted_at, window_start, today):
+                matches.setdefault(job.uid, (job, category))
+    return list(matches.values())
 
 
-def build_report(jobs: list[JobPosting], keywords: list[str]) -> str:
-    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
-    total = len(jobs)
-    counts = Counter(f"{job.provider}:{job.handle}" for job in jobs)
+def build_report(matches: list[tuple[JobPosting, str]], runs: list[RunLog]) -> str:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    source_counts = Counter(f"{job.provider}:{job.handle}" for job, _ in matches)
     rows = "\n".join(
-        f"| {src} | {count} |" for src, count in sorted(counts.items(), key=lambda x: x[0])
+        f"| {src} | {count} |" for src, count in sorted(source_counts.items())
+    ) or "| _None_ | 0 |"
+    category_counts = Counter(category or "uncategorized" for _, category in matches)
+    category_rows = "\n".join(
+        f"| {category} | {count} |" for category, count in sorted(category_counts.items())
     ) or "| _None_ | 0 |"
-    sample = sorted(jobs, key=_sort_key, reverse=True)[:10]
+    sample = sorted((job for job, _ in matches), key=_sort_key, reverse=True)[:10]
     sample_lines = "\n".join(
         f"- **{job.title}** @ {job.company or job.handle} — {job.location or 'N/A'} — {job.url}"
         for job in sample
     ) or "- No matches"
-    keywords_str = ", ".join(keywords)
+    latest = runs[-1] if runs else None
+    last_run = latest.started_at.strftime("%Y-%m-%d %H:%M UTC") if latest else "never"
+    keywords = ", ".join(latest.keywords) if latest and latest.keywords else "n/a"
+    failing = [
+        source
+        for source in (latest.sources if latest else [])
+        if source.get("error") or source.get("skipped")
+    ]
+    failing_lines = "\n".join(
+        f"- {source['source']}: {source.get('error') or 'skipped (backing off)'}"
+        for source in failing
+    ) or "- None"
     return f"""# Job Alert Report
 
 - Generated: {now}
-- Keywords: {keywords_str}
-- Matches: {total}
+- Runs read: {len(runs)} (latest {last_run})
+- Keywords: {keywords}
+- Matches: {len(matches)}
 
 | Source | Matches |
 | --- | --- |
 {rows}
 
+| Category | Matches |
+| --- | --- |
+{category_rows}
+
 ## Latest Matches (up to 10)
 {sample_lines}
+
+## Failing Sources (latest run)
+{failing_lines}
+"""
+
+
+def build_trends(rollups: Rollups, today: date) -> str:
+    week = (today - timedelta(days=6), today)
+    previous = (today - timedelta(days=13), today - timedelta(days=7))
+    current, before = rollups.by_source(*week), rollups.by_source(*previous)
+    ranked = sorted(current, key=lambda source: (-current[source]["sent"], source))
+    source_rows = "\n".join(
+        f"| {source} | {current[source]['sent']} | {before.get(source, {}).get('sent', 0)} "
+        f"| {_change(current[source]['sent'], before.get(source, {}).get('sent', 0))} "
+        f"| {_alert_hours(current[source])} |"
+        for source in ranked[:TREND_SOURCES]
+    ) or "| _None_ | 0 | 0 | — | — |"
+    mix, mix_before = rollups.by_category(*week), rollups.by_category(*previous)
+    category_rows = "\n".join(
+        f"| {category} | {mix.get(category, 0)} | {mix_before.get(category, 0)} "
+        f"| {_change(mix.get(category, 0), mix_before.get(category, 0))} |"
+        for category in sorted(set(mix) | set(mix_before))
+    ) or "| _None_ | 0 | 0 | — |"
+    daily_rows = "\n".join(
+        f"| {day} | {totals['sent']} | {_alert_hours(totals)} |"
+        for day, totals in rollups.daily(today - timedelta(days=13), today)
+    ) or "| _None_ | 0 | — |"
+    return f"""## Weekly Trends (top {TREND_SOURCES} sources, last 7 days vs the 7 before)
+| Source | This week | Last week | Change | Avg time to alert (h) |
+| --- | --- | --- | --- | --- |
+{source_rows}
+
+## Category Mix
+| Category | This week | Last week | Change |
+| --- | --- | --- | --- |
+{category_rows}
+
+## Daily Alerts (last 14 days)
+| Day | Sent | Avg time to alert (h) |
+| --- | --- | --- |
+{daily_rows}
 """
 
 
 def main() -> None:
-    load_dotenv()
-    settings = load_settings(Path("config/sources.yaml"))
-    keywords = [kw.lower() for kw in DEFAULT_KEYWORDS]
-    jobs = scrape_all(settings.sources.greenhouse, settings.sources.lever)
-    today = datetime.utcnow().date()
-    window_start = today - timedelta(days=1)
-    filtered = [
-        job
-        for job in jobs
-        if title_contains(job.title, keywords)
-        and _is_within_window(job, window_start, today)
-    ]
-    report = build_report(filtered, keywords)
-    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    REPORT_PATH.write_text(report)
-    print(f"Report written to {REPORT_PATH} with {len(filtered)} matches")
+    parser = argparse.ArgumentParser(description="Build reports/latest.md from the run log")
+    parser.add_argument("--runs", type=Path, default=RUN_LOG_DIR, help="jobbot.main --run-log")
+    parser.add_argument(
+        "--rollups", type=Path, default=ROLLUPS_PATH, help="jobbot.main --rollups"
+    )
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args()
+    window_start, today = posting_window()
+    since = datetime.combine(window_start, time.min, tzinfo=timezone.utc)
+    runs = read_runs(args.runs, since=since)
+    if not runs:
+        print(f"[report] No run logs in {args.runs} since {window_start}; run jobbot.main first")
+    matches = collect_matches(runs)
+    report = build_report(matches, runs) + "\n" + build_trends(load_rollups(args.rollups), today)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(report)
+    print(f"Report written to {args.output} with {len(matches)} matches from {len(runs)} run(s)")
+
+
+def _change(current: int, previous: int) -> str:
+    if not previous:
+        return "new" if current else "—"
+    return f"{(current - previous) / previous:+.0%}"
+
+
+def _alert_hours(totals: dict) -> str:
+    if not totals["alerted"]:
+        return "—"
+    return f"{totals['alert_seconds'] / totals['alerted'] / 3600:.1f}"
 
 
 def _sort_key(job: JobPosting) -> datetime:
@@ -82,17 +162,5 @@ def _sort_key(job: JobPosting) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
-def _is_within_window(job: JobPosting, start_date, end_date) -> bool:
-    if not job.posted_at:
-        return False
-    dt = job.posted_at
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    else:
-        dt = dt.astimezone(timezone.utc)
-    job_date = dt.date()
-    return start_date <= job_date <= end_date
-
-
 if __name__ == "__main__":
     main()
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
 import json
+import sys
+import time
 from dataclasses import dataclass
-from typing import Callable, Optional
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
 
 import httpx
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from jobbot.config import ScrapeOptions
+from jobbot.transport import build_async_client
+
 
 @dataclass
 class VendorEntry:
@@ -51,40 +63,92 @@ OTHER_ENTRIES = [
 ENTRIES = GREENHOUSE_HANDLES + LEVER_HANDLES + MAG7_AND_OTHERS + OTHER_ENTRIES
 
 
-def check_greenhouse(entry: VendorEntry) -> tuple[str, Optional[int]]:
-    url = f"https://boards-api.greenhouse.io/v1/boards/{entry.handle}/jobs"
-    resp = httpx.get(url, timeout=15)
+CACHE_PATH = Path(".cache/vendor_probe.json")
+# Only definitive answers are cached; 429s, 5xx and network errors are re-probed next run.
+CACHEABLE = ("OK", "HTTP 404", "HTTP 410")
+# Some career sites reject HEAD; fall back to a ranged GET that reads no body.
+HEAD_REJECTED = (403, 405, 501)
+
+Probe = tuple[str, Optional[int]]
+
+
+class ProbeCache:
+    def __init__(self, path: Path, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.schema = 2
+        self.results: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return
+        if data.get("schema") == self.schema:
+            self.results = data.get("results", {})
+
+    def get(self, key: str, now: float) -> Probe | None:
+        cached = self.results.get(key)
+        if cached is None or now - cached["checked_at"] > self.ttl:
+            return None
+        return cached["status"], cached.get("jobs")
+
+    def put(self, key: str, probe: Probe, now: float) -> None:
+        if probe[0] not in CACHEABLE:
+            return
+        self.results[key] = {"status": probe[0], "jobs": probe[1], "checked_at": now}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema": self.schema, "results": self.results}
+        self.path.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")))
+        self._dirty = False
+
+
+async def check_greenhouse(
+    client: httpx.AsyncClient, entry: VendorEntry, counts: bool = True
+) -> Probe:
+    # The board endpoint is a few hundred bytes; only fetch the job list when counting.
+    suffix = "/jobs" if counts else ""
+    resp = await client.get(f"https://boards-api.greenhouse.io/v1/boards/{entry.handle}{suffix}")
     if resp.is_success:
-        data = resp.json()
-        return "OK", len(data.get("jobs", []))
+        return "OK", len(resp.json().get("jobs", [])) if counts else None
     return f"HTTP {resp.status_code}", None
 
 
-def check_lever(entry: VendorEntry) -> tuple[str, Optional[int]]:
-    url = f"https://api.lever.co/v0/postings/{entry.handle}?mode=json"
-    resp = httpx.get(url, timeout=15)
+async def check_lever(client: httpx.AsyncClient, entry: VendorEntry, counts: bool = True) -> Probe:
+    params = {"mode": "json"} if counts else {"mode": "json", "limit": "1"}
+    resp = await client.get(f"https://api.lever.co/v0/postings/{entry.handle}", params=params)
     if resp.is_success:
-        data = resp.json()
-        return "OK", len(data)
+        return "OK", len(resp.json()) if counts else None
     return f"HTTP {resp.status_code}", None
 
 
-def check_amazon(entry: VendorEntry) -> tuple[str, Optional[int]]:
-    resp = httpx.get(entry.url, timeout=15)
+async def check_amazon(client: httpx.AsyncClient, entry: VendorEntry, counts: bool = True) -> Probe:
+    resp = await client.get(entry.url)
     if resp.is_success:
-        data = resp.json()
-        return "OK", len(data.get("jobs", []))
+        return "OK", len(resp.json().get("jobs", []))
     return f"HTTP {resp.status_code}", None
 
 
-def check_html(entry: VendorEntry) -> tuple[str, Optional[int]]:
-    resp = httpx.get(entry.url, timeout=15)
+async def check_html(client: httpx.AsyncClient, entry: VendorEntry, counts: bool = True) -> Probe:
+    resp = await client.head(entry.url)
+    if resp.status_code in HEAD_REJECTED:
+        async with client.stream("GET", entry.url, headers={"Range": "bytes=0-0"}) as resp:
+            pass
     if resp.is_success:
         return "OK", None
     return f"HTTP {resp.status_code}", None
 
 
-DISPATCH: dict[str, Callable[[VendorEntry], tuple[str, Optional[int]]]] = {
+DISPATCH: dict[str, Callable[[httpx.AsyncClient, VendorEntry, bool], Awaitable[Probe]]] = {
     "gh": check_greenhouse,
     "lever": check_lever,
     "amazon": check_amazon,
@@ -92,33 +156,97 @@ DISPATCH: dict[str, Callable[[VendorEntry], tuple[str, Optional[int]]]] = {
 }
 
 
-def main() -> None:
-    results = []
-    for entry in ENTRIES:
+def cache_key(entry: VendorEntry, counts: bool) -> str:
+    # A probe without counts has no job count to offer a later --counts run.
+    return f"{entry.kind}:{entry.handle or entry.url}:{'counts' if counts else 'exists'}"
+
+
+def load_candidates(path: Path) -> List[VendorEntry]:
+    # One slug per line; "greenhouse:slug" or "lever:slug" limits the probe to one vendor.
+    entries: List[VendorEntry] = []
+    for line in path.read_text().splitlines():
+        slug = line.split("#", 1)[0].strip().lower()
+        if not slug:
+            continue
+        vendor, _, handle = slug.rpartition(":")
+        if vendor in ("", "greenhouse"):
+            entries.append(VendorEntry(handle, "Greenhouse", "gh", handle=handle))
+        if vendor in ("", "lever"):
+            entries.append(VendorEntry(handle, "Lever", "lever", handle=handle))
+    return entries
+
+
+async def probe_all(
+    entries: List[VendorEntry],
+    cache: ProbeCache,
+    *,
+    concurrency: int,
+    counts: bool,
+) -> List[dict]:
+    limit = asyncio.Semaphore(concurrency)
+    now = time.time()
+
+    async def probe(client: httpx.AsyncClient, entry: VendorEntry) -> dict:
+        payload = {"company": entry.company, "vendor": entry.vendor}
         handler = DISPATCH.get(entry.kind)
         if not handler:
-            results.append({"company": entry.company, "vendor": entry.vendor, "status": "SKIPPED"})
-            continue
-        try:
-            status, count = handler(entry)
-        except Exception as exc:  # noqa: BLE001
-            results.append(
-                {
-                    "company": entry.company,
-                    "vendor": entry.vendor,
-                    "status": "ERROR",
-                    "detail": repr(exc),
-                }
-            )
-        else:
-            payload = {
-                "company": entry.company,
-                "vendor": entry.vendor,
-                "status": status,
-            }
-            if count is not None:
-                payload["jobs"] = count
-            results.append(payload)
+            return {**payload, "status": "SKIPPED"}
+        key = cache_key(entry, counts)
+        result = cache.get(key, now)
+        if result is None:
+            try:
+                async with limit:
+                    result = await handler(client, entry, counts)
+            except Exception as exc:  # noqa: BLE001
+                return {**payload, "status": "ERROR", "detail": repr(exc)}
+            cache.put(key, result, now)
+        status, count = result
+        payload["status"] = status
+        if count is not None:
+            payload["jobs"] = count
+        return payload
+
+    options = ScrapeOptions(max_concurrency=concurrency, timeout=15)
+    async with build_async_client(options) as client:
+        return list(await asyncio.gather(*(probe(client, entry) for entry in entries)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Probe the vendor map or discover new boards")
+    parser.add_argument(
+        "--candidates",
+        type=Path,
+        help="File of Greenhouse/Lever slugs to probe instead of the built-in vendor map; "
+        "only boards that exist are printed",
+    )
+    parser.add_argument("--concurrency", type=int, default=32, help="Max in-flight probes")
+    parser.add_argument("--ttl-hours", type=float, default=24.0, help="Reuse results this fresh")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached results")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH)
+    parser.add_argument(
+        "--counts",
+        action="store_true",
+        help="Also count open jobs for candidate boards (downloads each job list)",
+    )
+    args = parser.parse_args()
+    cache = ProbeCache(args.cache, 0 if args.refresh else args.ttl_hours * 3600)
+    entries = load_candidates(args.candidates) if args.candidates else ENTRIES
+    counts = args.counts or not args.candidates
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(
+            probe_all(entries, cache, concurrency=args.concurrency, counts=counts)
+        )
+    finally:
+        # Keep what was probed so an interrupted discovery run resumes where it stopped.
+        cache.save()
+    if args.candidates:
+        results = [result for result in results if result["status"] == "OK"]
+        print(
+            f"Found {len(results)} board(s) among {len(entries)} probes "
+            f"in {time.perf_counter() - started:.1f}s",
+            file=sys.stderr,
+        )
     print(json.dumps(results, indent=2))
 
 
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks.bench_pipeline import BenchConfig, run
+
+
+def test_benchmark_pipeline_runs_end_to_end(tmp_path: Path) -> None:
+    config = BenchConfig(
+        greenhouse_boards=3,
+        lever_boards=2,
+        workday_tenants=1,
+        jobs_per_board=40,
+        recent_fraction=0.5,
+        latency_ms=0,
+        rate_429=0.2,
+    )
+    stats = {stage.name: stage for stage in run(config, tmp_path)}
+
+    assert list(stats) == ["scrape", "filter", "dedupe", "notify"]
+    assert stats["scrape"].items >= 200 and stats["scrape"].requests >= 7
+    assert 0 < stats["dedupe"].items == stats["notify"].items
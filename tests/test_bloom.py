@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from jobbot.bloom import BloomFilter
+
+
+def test_bloom_round_trip_and_error_bound(tmp_path: Path) -> None:
+    bloom = BloomFilter.for_capacity(2_000, 0.01)
+    for i in range(2_000):
+        bloom.add(f"greenhouse:stripe:{i}")
+    path = tmp_path / "filter.bloom"
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert all(f"greenhouse:stripe:{i}" in loaded for i in range(2_000))
+    false_hits = sum(f"lever:spotify:{i}" in loaded for i in range(10_000))
+    assert false_hits / 10_000 < 0.02
+    assert loaded.false_positive_rate() <= 0.0105
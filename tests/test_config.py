@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from jobbot import config
+from jobbot.config import load_settings_cached
+
+
+def test_settings_snapshot_skips_yaml_until_config_changes(tmp_path: Path, monkeypatch) -> None:
+    sources = tmp_path / "sources.yaml"
+    sources.write_text("greenhouse:\n  - stripe\n")
+    webhooks = tmp_path / "webhooks.yaml"
+    webhooks.write_text("general: https://discord.com/api/webhooks/1/abc\n")
+    routing = tmp_path / "routing.yaml"
+    snapshot = tmp_path / "settings.json"
+    monkeypatch.delenv("DISCORD_WEBHOOK_URL", raising=False)
+
+    first, hit = load_settings_cached(sources, webhooks, routing, snapshot_path=snapshot)
+    assert not hit
+
+    read_yaml = config._read_yaml
+
+    def only_webhooks(path: Path) -> dict:
+        assert path == webhooks, f"yaml re-read: {path}"
+        return read_yaml(path)
+
+    monkeypatch.setattr(config, "_read_yaml", only_webhooks)
+    second, hit = load_settings_cached(sources, webhooks, routing, snapshot_path=snapshot)
+    assert hit and second == first
+
+    os.utime(sources, ns=(1, 1))
+    third, hit = load_settings_cached(sources, webhooks, routing, snapshot_path=snapshot)
+    assert hit and third == first
+
+    monkeypatch.undo()
+    sources.write_text("greenhouse:\n  - figma\n")
+    fourth, hit = load_settings_cached(sources, webhooks, routing, snapshot_path=snapshot)
+    assert not hit and fourth.sources.greenhouse == ["figma"]
+
+
+def test_settings_snapshot_never_stores_webhook_urls(tmp_path: Path, monkeypatch) -> None:
+    sources = tmp_path / "sources.yaml"
+    sources.write_text("greenhouse:\n  - stripe\n")
+    snapshot = tmp_path / "settings.json"
+    monkeypatch.setenv("DISCORD_WEBHOOK_URL", "https://discord.com/api/webhooks/1/first-secret")
+
+    load_settings_cached(sources, tmp_path / "none.yaml", snapshot_path=snapshot)
+    monkeypatch.setenv("DISCORD_WEBHOOK_URL", "https://discord.com/api/webhooks/1/rotated")
+    settings, hit = load_settings_cached(sources, tmp_path / "none.yaml", snapshot_path=snapshot)
+
+    assert hit and settings.webhook_for("general").endswith("/rotated")
+    assert "secret" not in snapshot.read_text() and "webhooks/" not in snapshot.read_text()
+
+
+def test_snapshot_hit_skips_yaml_and_validation(tmp_path: Path, monkeypatch) -> None:
+    sources = tmp_path / "sources.yaml"
+    sources.write_text("greenhouse:\n  - stripe\nlever:\n  - handle: spotify\n    page_size: 50\n")
+    snapshot = tmp_path / "settings.json"
+    webhooks = tmp_path / "webhooks.yaml"
+    for suffix in ("", "_SOFTWARE", "_DATA"):
+        url = f"https://discord.com/api/webhooks/1/x{suffix}"
+        monkeypatch.setenv(f"DISCORD_WEBHOOK_URL{suffix}", url)
+    first, _ = load_settings_cached(sources, webhooks, snapshot_path=snapshot)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed or validated on a snapshot hit")
+
+    monkeypatch.setattr(config, "_read_yaml", fail)
+    monkeypatch.setattr(config.SourceConfig, "model_validate", fail)
+    monkeypatch.setattr(config.RoutingConfig, "model_validate", fail)
+    settings, hit = load_settings_cached(sources, webhooks, snapshot_path=snapshot)
+
+    assert hit and settings == first
+    assert settings.sources.lever[0].page_size == 50
+    assert settings.webhook_for("data").endswith("x_DATA")
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from jobbot.daemon import Scheduler
+
+
+def test_scheduler_survives_failed_cycle_and_flushes_on_stop() -> None:
+    events: list[str] = []
+
+    def cycle() -> None:
+        events.append("cycle")
+        if len(events) == 1:
+            raise RuntimeError("board exploded")
+        if events.count("cycle") == 3:
+            scheduler.stop_event.set()
+
+    scheduler = Scheduler(
+        cycle, lambda: events.append("flush"), interval=0, flush_interval=3600
+    )
+    scheduler.run()
+
+    assert events == ["cycle", "cycle", "cycle", "flush"]
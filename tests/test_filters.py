@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import date
+
+from jobbot.config import DEFAULT_ROUTING
+from jobbot.filters import Prefilter, uid_hash
+from jobbot.metrics import source_context
+from jobbot.routing import Router
+from jobbot.sources import greenhouse
+
+PAYLOAD = {
+    "jobs": [
+        {"id": 1, "title": "Data Engineer", "updated_at": "2026-01-02T09:00:00Z"},
+        {"id": 2, "title": "Data Engineer", "updated_at": "2026-01-02T09:00:00Z"},
+        {"id": 3, "title": "Chef", "updated_at": "2026-01-02T09:00:00Z"},
+        {"id": 4, "title": "Software Engineer", "updated_at": "2025-11-01T09:00:00Z"},
+        {"id": 5, "title": "Software Engineer", "updated_at": "not a date"},
+    ]
+}
+
+
+def test_prefilter_drops_raw_records_before_building_postings() -> None:
+    parsed: list[str] = []
+    prefilter = Prefilter(
+        lambda uid: uid == "greenhouse:acme:2",
+        Router(DEFAULT_ROUTING),
+        date(2026, 1, 1),
+        date(2026, 1, 2),
+    )
+
+    def parse(value: str):
+        parsed.append(value)
+        return greenhouse._parse_dt(value)
+
+    jobs = greenhouse.JobPosting.bulk(
+        "greenhouse", "acme", greenhouse.extract_records(PAYLOAD), parse, prefilter
+    )
+
+    assert [job.uid for job in jobs] == ["greenhouse:acme:1"]
+    assert prefilter.total == 5
+    assert prefilter.dropped == {"dedupe": 1, "keywords": 1, "window": 2}
+    assert [prefilter.kept_after(name) for name in ("dedupe", "keywords", "window")] == [4, 3, 1]
+    # Only records that passed dedupe and the title match had their timestamp parsed.
+    assert len(parsed) == 3
+
+
+def test_prefilter_hashes_raw_ids_per_source() -> None:
+    def raw_uids(payload: dict, seen) -> set:
+        prefilter = Prefilter(
+            seen, Router(DEFAULT_ROUTING), date(2026, 1, 1), date(2026, 1, 2), track_uids=True
+        )
+        with source_context("greenhouse:acme"):
+            greenhouse.parse_jobs("acme", payload, prefilter)
+        return prefilter.raw_uids("greenhouse:acme")
+
+    baseline = raw_uids(PAYLOAD, lambda uid: False)
+    # Dropped records still count; a new id adds exactly one hash.
+    assert len(baseline) == 5 and raw_uids(PAYLOAD, lambda uid: True) == baseline
+    grown = {"jobs": [*PAYLOAD["jobs"], {"id": 6, "title": "Chef"}]}
+    assert raw_uids(grown, lambda uid: True) - baseline == {uid_hash("greenhouse:acme:6")}
+
+    # Without a poller the hot path skips the hashing entirely.
+    untracked = Prefilter(
+        lambda uid: False, Router(DEFAULT_ROUTING), date(2026, 1, 1), date(2026, 1, 2)
+    )
+    with source_context("greenhouse:acme"):
+        greenhouse.parse_jobs("acme", PAYLOAD, untracked)
+    assert untracked.total == 5 and not untracked.raw_uids("greenhouse:acme")
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from jobbot.config import HealthOptions
+from jobbot.health import SourceHealth
+from jobbot.scraper import SourceRef
+
+OPTIONS = HealthOptions(failure_threshold=2, base_backoff=60, max_backoff=300)
+
+
+def test_failing_source_backs_off_exponentially_and_recovers(tmp_path: Path) -> None:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    dead, alive = SourceRef("greenhouse", "renamed"), SourceRef("lever", "spotify")
+    health = SourceHealth(tmp_path / "health.json", OPTIONS)
+
+    assert health.record_failure(dead.key, "HTTPStatusError 404", now) == 0
+    assert health.allow([dead, alive], now) == ([dead, alive], [])
+    backoffs = [health.record_failure(dead.key, "HTTPStatusError 404", now) for _ in range(4)]
+    assert backoffs == [60, 120, 240, 300]
+    health.save()
+
+    reloaded = SourceHealth(tmp_path / "health.json", OPTIONS)
+    assert reloaded.allow([dead, alive], now) == ([alive], [dead])
+    assert reloaded.allow([dead], now + timedelta(seconds=300)) == ([dead], [])
+    assert reloaded.report()[dead.key]["consecutive_failures"] == 5
+
+    reloaded.record_success(dead.key, now)
+    assert reloaded.report() == {}
+    assert reloaded.allow([dead], now) == ([dead], [])
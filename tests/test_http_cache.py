@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+
+from jobbot.http_cache import ResponseCache
+from jobbot.sources import greenhouse
+
+BOARD = {"jobs": [{"id": 7, "title": "Software Engineer", "absolute_url": "https://x"}]}
+
+
+def test_conditional_get_reuses_parsed_jobs(tmp_path: Path, monkeypatch) -> None:
+    seen_headers: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=BOARD, headers={"ETag": '"v1"'})
+
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(greenhouse.httpx, "Client", client_factory)
+    cache_path = tmp_path / "cache.json"
+    cache = ResponseCache(cache_path)
+    first = greenhouse.fetch_jobs("stripe", cache=cache)
+    cache.save()
+    second = greenhouse.fetch_jobs("stripe", cache=ResponseCache(cache_path))
+
+    assert seen_headers[-1]["If-None-Match"] == '"v1"'
+    assert [job.uid for job in second] == [job.uid for job in first] == ["greenhouse:stripe:7"]
+    # Raw records are cached, so predicates still apply to a 304'd board.
+    assert greenhouse.fetch_jobs("stripe", cache=cache, keep=lambda *record: False) == []
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from jobbot.config import LeverSource, SourceConfig
+from jobbot.sources import lever
+
+JOBS = [{"id": str(i), "text": "Data Engineer", "createdAt": 0} for i in range(250)]
+
+
+def test_pages_with_skip_limit_and_server_side_filters() -> None:
+    requests: list[httpx.URL] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        skip, limit = int(request.url.params["skip"]), int(request.url.params["limit"])
+        return httpx.Response(200, json=JOBS[skip : skip + limit])
+
+    source = LeverSource(handle="spotify", page_size=100, team=["Data", "Platform"])
+
+    async def run() -> list:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await lever.fetch_jobs_async(source, client)
+
+    jobs = asyncio.run(run())
+    assert len(jobs) == 250
+    assert [url.params["skip"] for url in requests] == ["0", "100", "200"]
+    assert requests[0].params.get_list("team") == ["Data", "Platform"]
+    assert requests[0].params["mode"] == "json"
+
+
+def test_lever_config_accepts_plain_handles() -> None:
+    config = SourceConfig(
+        lever=["spotify", " ", {"handle": "netflix", "commitment": ["Full-time"]}]
+    )
+    assert [source.handle for source in config.lever] == ["spotify", "netflix"]
+    assert config.lever[1].commitment == ["Full-time"]
+    assert "commitment=Full-time" in lever.page_url(config.lever[1], 0)
+
+
+def test_pager_stops_when_server_ignores_skip(monkeypatch) -> None:
+    calls = 0
+    honour_skip = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        skip, limit = int(request.url.params["skip"]), int(request.url.params["limit"])
+        return httpx.Response(200, json=JOBS[skip : skip + limit] if honour_skip else JOBS[:3])
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        httpx,
+        "Client",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+
+    jobs = lever.fetch_jobs(LeverSource(handle="spotify", page_size=3))
+    assert [job.uid for job in jobs] == ["lever:spotify:0", "lever:spotify:1", "lever:spotify:2"]
+    assert calls == 2
+
+    calls, honour_skip = 0, True
+    capped = lever.fetch_jobs(LeverSource(handle="spotify", page_size=10, max_postings=25))
+    assert calls == 3 and len(capped) == 30
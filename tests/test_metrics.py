@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+
+from jobbot.config import ScrapeOptions
+from jobbot.metrics import METRICS, Metrics
+from jobbot.scraper import iter_sources, scrape_sources_async
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    handle = request.url.path.split("/")[3]
+    if handle == "broken":
+        return httpx.Response(500)
+    return httpx.Response(200, json={"jobs": [{"id": 1, "title": "Data Engineer"}]})
+
+
+def test_scrape_records_per_source_responses_and_parse_time() -> None:
+    async def run() -> list:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+            return await scrape_sources_async(
+                iter_sources(["stripe", "broken"], []), options=ScrapeOptions(), client=client
+            )
+
+    METRICS.reset()
+    asyncio.run(run())
+    snapshot = METRICS.snapshot()
+    statuses = {
+        (s["labels"]["source"], s["labels"]["status"]): s["value"]
+        for s in snapshot["counters"]["http_responses_total"]
+    }
+    assert statuses == {("greenhouse:stripe", "200"): 1, ("greenhouse:broken", "500"): 1}
+    assert snapshot["counters"]["source_errors_total"][0]["labels"] == {
+        "source": "greenhouse:broken"
+    }
+    parsed = [s["labels"]["source"] for s in snapshot["timers"]["parse_seconds"]]
+    assert parsed == ["greenhouse:stripe"]
+    METRICS.reset()
+
+
+def test_reports_are_written_as_json_and_prometheus_text(tmp_path: Path) -> None:
+    metrics = Metrics()
+    metrics.inc("filter_jobs_total", 3, filter="dedupe", outcome="kept")
+    metrics.inc("filter_jobs_total", 2, filter="dedupe", outcome="kept")
+    metrics.observe("stage_seconds", 0.5, stage="scrape")
+    metrics.observe("stage_seconds", 1.5, stage="scrape")
+
+    metrics.write_json(tmp_path / "run.json", {"sent": 4})
+    report = json.loads((tmp_path / "run.json").read_text())
+    assert report["sent"] == 4
+    assert report["counters"]["filter_jobs_total"][0]["value"] == 5
+    assert report["timers"]["stage_seconds"][0] == {
+        "labels": {"stage": "scrape"},
+        "count": 2,
+        "total_seconds": 2.0,
+        "max_seconds": 1.5,
+    }
+
+    metrics.write_prometheus(tmp_path / "jobbot.prom")
+    lines = (tmp_path / "jobbot.prom").read_text().splitlines()
+    assert 'jobbot_filter_jobs_total{filter="dedupe",outcome="kept"} 5' in lines
+    assert 'jobbot_stage_seconds_sum{stage="scrape"} 2' in lines
+    assert 'jobbot_stage_seconds_count{stage="scrape"} 2' in lines
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pickle
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timezone
+
+import pytest
+
+from jobbot.models import JobPosting
+from jobbot.sources import greenhouse
+
+
+def test_bulk_postings_are_slotted_interned_and_lazily_dated() -> None:
+    calls = []
+
+    def parse(value: str) -> datetime:
+        calls.append(value)
+        return datetime.fromisoformat(value)
+
+    records = [
+        (1, "Data Engineer", "".join(["Acme", " Corp"]), "Remote", "https://a/1", "2024-05-01"),
+        (2, "Designer", "".join(["Acme", " Corp"]), None, "https://a/2", None),
+    ]
+    first, second = JobPosting.bulk("greenhouse", "acme", records, parse)
+
+    assert not hasattr(first, "__dict__")
+    assert first.uid == "greenhouse:acme:1"
+    assert first.company is second.company
+    assert calls == []
+    assert first.posted_at == datetime(2024, 5, 1)
+    assert first.posted_at == datetime(2024, 5, 1)
+    assert calls == ["2024-05-01"]
+    assert second.posted_at is None
+    with pytest.raises(FrozenInstanceError):
+        first.title = "Other"
+
+
+def test_lazy_postings_keep_value_semantics() -> None:
+    payload = {
+        "jobs": [
+            {
+                "id": 7,
+                "title": "Software Engineer",
+                "absolute_url": "https://x",
+                "updated_at": "2024-05-01T10:00:00Z",
+            }
+        ]
+    }
+    [job] = greenhouse.parse_jobs("stripe", payload)
+    eager = JobPosting(
+        "greenhouse:stripe:7",
+        "greenhouse",
+        "stripe",
+        "Software Engineer",
+        "stripe",
+        None,
+        "https://x",
+        datetime(2024, 5, 1, 10, tzinfo=timezone.utc),
+    )
+
+    assert job == eager and hash(job) == hash(eager)
+    assert JobPosting.from_dict(job.to_dict()) == eager
+    assert pickle.loads(pickle.dumps(job)) == eager
+    assert len({job, eager}) == 1
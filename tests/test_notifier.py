@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+
+from jobbot.models import JobPosting
+from jobbot.notifier import DiscordNotifier
+from jobbot.ratelimit import RateLimiter
+
+
+def _job(i: int, title: str = "Software Engineer") -> JobPosting:
+    return JobPosting(
+        uid=f"greenhouse:stripe:{i}",
+        provider="greenhouse",
+        handle="stripe",
+        title=title,
+        company="Stripe",
+        location=None,
+        url=f"https://example.com/{i}",
+        posted_at=None,
+    )
+
+
+def test_send_batches_embeds_in_order(monkeypatch) -> None:
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(204)
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        "jobbot.notifier.httpx.Client",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    notifier = DiscordNotifier("https://discord.test/hook", per_message_delay=0, batch_size=10)
+
+    assert notifier.send([_job(i) for i in range(23)]) == 23
+    assert [len(body["embeds"]) for body in bodies] == [10, 10, 3]
+    urls = [embed["url"] for body in bodies for embed in body["embeds"]]
+    assert urls == [f"https://example.com/{i}" for i in range(23)]
+
+
+def test_chunks_respect_character_budget() -> None:
+    notifier = DiscordNotifier("https://discord.test/hook", batch_size=10)
+    embeds = [notifier._build_embed(_job(i, title="x" * 1900)) for i in range(5)]
+    assert [len(chunk) for chunk in notifier._chunk_embeds(embeds)] == [2, 2, 1]
+
+
+def test_rate_limit_bucket_waits_for_reset(monkeypatch) -> None:
+    clock = {"now": 100.0}
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr("jobbot.ratelimit.time.monotonic", lambda: clock["now"])
+    monkeypatch.setattr("jobbot.ratelimit.time.sleep", fake_sleep)
+    bucket = RateLimiter().bucket("https://discord.test/hook")
+
+    bucket.acquire()
+    bucket.update({"X-RateLimit-Remaining": "1", "X-RateLimit-Reset-After": "2.5"})
+    bucket.acquire()
+    assert sleeps == []
+    bucket.acquire()
+    assert sleeps == [2.5]
+    assert bucket.slept == 2.5
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from jobbot.models import JobPosting
+from jobbot.notifier import DiscordNotifier, send_all
+from jobbot.outbox import Outbox
+
+
+def _job(i: int) -> JobPosting:
+    return JobPosting(
+        uid=f"greenhouse:stripe:{i}",
+        provider="greenhouse",
+        handle="stripe",
+        title=f"Engineer {i}",
+        company="Stripe",
+        location=None,
+        url=f"https://example.com/{i}",
+        posted_at=None,
+    )
+
+
+def test_failed_send_keeps_unacknowledged_jobs_queued(tmp_path, monkeypatch) -> None:
+    posts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal posts
+        posts += 1
+        return httpx.Response(204 if posts == 1 else 500)
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        "jobbot.notifier.httpx.Client",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    outbox = Outbox(tmp_path / "outbox.jsonl")
+    jobs = [_job(i) for i in range(5)]
+    assert outbox.enqueue("software", jobs) == 5
+    assert outbox.enqueue("software", jobs[:2]) == 0
+    notifier = DiscordNotifier(
+        "https://discord.test/hook", per_message_delay=0, batch_size=2, max_retries=1
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        notifier.send(jobs, on_sent=outbox.ack)
+
+    # A crash before the ledger is saved: the acked uids survive and pending jobs resume.
+    with (tmp_path / "outbox.jsonl").open("a") as handle:
+        handle.write('{"schema": 1, "op": "ack", "uids": ["greenh')
+    reloaded = Outbox(tmp_path / "outbox.jsonl")
+    assert sorted(reloaded.acked) == ["greenhouse:stripe:0", "greenhouse:stripe:1"]
+    assert [job.title for job in reloaded.by_channel()["software"]] == [
+        "Engineer 2",
+        "Engineer 3",
+        "Engineer 4",
+    ]
+
+    reloaded.compact()
+    assert len(Outbox(tmp_path / "outbox.jsonl")) == 3
+    reloaded.ack(reloaded.by_channel()["software"])
+    reloaded.compact()
+    assert not (tmp_path / "outbox.jsonl").exists()
+
+
+def test_rejected_job_is_dead_lettered_and_unblocks_channel(tmp_path, monkeypatch) -> None:
+    posted: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        titles = [embed["title"] for embed in json.loads(request.content)["embeds"]]
+        if "Engineer 1" in titles:
+            return httpx.Response(400)
+        posted.extend(titles)
+        return httpx.Response(204)
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        "jobbot.notifier.httpx.Client",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    path = tmp_path / "outbox.jsonl"
+    Outbox(path).enqueue("software", [_job(i) for i in range(3)])
+    notifier = DiscordNotifier("https://discord.test/hook", per_message_delay=0, batch_size=2)
+
+    for _ in range(3):
+        outbox = Outbox(path)
+        results = send_all(
+            [(notifier, outbox.by_channel().get("software", []))],
+            on_sent=outbox.ack,
+            on_rejected=outbox.reject,
+        )
+        assert results == [None]
+        outbox.compact()
+
+    outbox = Outbox(path)
+    assert list(outbox.dead) == ["greenhouse:stripe:1"] and "greenhouse:stripe:1" in outbox
+    assert send_all([(notifier, outbox.by_channel()["software"])], on_sent=outbox.ack) == [1]
+    assert posted == ["Engineer 0", "Engineer 2"]
+    outbox.compact()
+    assert list(Outbox(path).dead) == ["greenhouse:stripe:1"] and not Outbox(path).pending
+
+
+def test_deleted_webhook_keeps_jobs_queued_without_charging_them(tmp_path, monkeypatch) -> None:
+    status = 404
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status)
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        "jobbot.notifier.httpx.Client",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    path = tmp_path / "outbox.jsonl"
+    Outbox(path).enqueue("software", [_job(i) for i in range(3)])
+    notifier = DiscordNotifier("https://discord.test/hook", per_message_delay=0, batch_size=2)
+
+    for _ in range(4):
+        outbox = Outbox(path)
+        deliveries = [(notifier, outbox.by_channel()["software"])]
+        assert send_all(deliveries, on_sent=outbox.ack, on_rejected=outbox.reject) == [None]
+
+    outbox = Outbox(path)
+    assert not outbox.dead and len(outbox) == 3
+    assert not any(record.get("attempts") for record in outbox.pending.values())
+
+    status = 204
+    assert send_all([(notifier, outbox.by_channel()["software"])], on_sent=outbox.ack) == [3]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from jobbot.config import PollingOptions
+from jobbot.models import JobPosting
+from jobbot.polling import AdaptivePoller
+from jobbot.scraper import SourceRef
+
+OPTIONS = PollingOptions(min_interval=60, max_interval=600, speedup=0.5, backoff=2)
+
+
+def _job(uid: str, posted_at: datetime) -> JobPosting:
+    return JobPosting(uid, "greenhouse", "stripe", "Engineer", "Stripe", None, "https://x", posted_at)
+
+
+def test_interval_backs_off_when_quiet_and_speeds_up_on_change(tmp_path: Path) -> None:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    ref = SourceRef("greenhouse", "stripe")
+    poller = AdaptivePoller(tmp_path / "poll_state.json", OPTIONS)
+    jobs = [_job("a", start - timedelta(days=3))]
+
+    now = start
+    for _ in range(4):
+        poller.record(ref.key, jobs, now)
+        now += timedelta(seconds=poller.sources[ref.key]["interval"])
+    assert poller.sources[ref.key]["interval"] == 480
+    assert poller.due([ref], now - timedelta(seconds=1)) == []
+    assert poller.due([ref], now) == [ref]
+
+    jobs = jobs + [_job("b", now - timedelta(seconds=5))]
+    poller.record(ref.key, jobs, now)
+    state = poller.sources[ref.key]
+    assert state["interval"] == 240 and state["new_uids"] == 1 and state["changes"] == 2
+    poller.save()
+    assert AdaptivePoller(tmp_path / "poll_state.json", OPTIONS).sources == poller.sources
+
+
+def test_raw_uids_override_filtered_jobs(tmp_path: Path) -> None:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    poller = AdaptivePoller(tmp_path / "poll_state.json", OPTIONS)
+    key = "workday:acme:ext"
+    poller.record(key, [], now, uids={"a", "b"})
+    poller.record(key, [], now, uids={"a", "b"})
+    assert poller.sources[key]["interval"] == 120
+
+    # A removal changes the board but brings nothing new, so the interval holds.
+    poller.record(key, [], now, uids={"a"})
+    assert poller.sources[key]["interval"] == 120
+    # Nothing survived the prefilter, but the board itself has a new id.
+    poller.record(key, [], now, uids={"a", "c"})
+    state = poller.sources[key]
+    assert state["interval"] == 60 and state["changes"] == 3 and state["new_uids"] == 1
+
+
+def test_snapshot_counts_feed_the_interval(tmp_path: Path) -> None:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    poller = AdaptivePoller(tmp_path / "poll_state.json", OPTIONS)
+    key = "lever:acme"
+    poller.record(key, [], now, changed=True, new_uids=3)
+    poller.record(key, [], now, changed=False, new_uids=0)
+    poller.record(key, [], now, changed=True, new_uids=0)
+    assert poller.sources[key]["interval"] == 120
+    poller.record(key, [], now, changed=True, new_uids=2)
+    state = poller.sources[key]
+    assert state["interval"] == 60 and state["new_uids"] == 2 and "uids" not in state
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from jobbot.rollups import Rollups, load_rollups, rebuild_from_ledger
+from jobbot.store import DedupeStore
+
+
+def test_rollups_aggregate_days_sources_and_shards(tmp_path) -> None:
+    sent = datetime(2026, 3, 9, 12, tzinfo=timezone.utc)
+    rollups = Rollups(tmp_path / "rollups.json")
+    rollups.record("greenhouse:stripe", "software", sent, sent - timedelta(hours=2))
+    rollups.record("greenhouse:stripe", "data", sent, sent - timedelta(hours=4))
+    rollups.record("lever:spotify", "data", sent - timedelta(days=7), None)
+    rollups.save()
+    shard = Rollups(tmp_path / "rollups.shard-1-of-2.json")
+    shard.record("lever:spotify", "data", sent, sent - timedelta(hours=1))
+    shard.save()
+
+    merged = load_rollups(tmp_path / "rollups.json")
+    week = (date(2026, 3, 3), date(2026, 3, 9))
+    totals = merged.by_source(*week)
+    assert totals["greenhouse:stripe"] == {"sent": 2, "alerted": 2, "alert_seconds": 6 * 3600}
+    assert totals["lever:spotify"]["sent"] == 1
+    assert merged.by_category(*week) == {"software": 1, "data": 2}
+    assert merged.by_category(date(2026, 2, 24), date(2026, 3, 2)) == {"data": 1}
+    assert [day for day, _ in merged.daily(date(2026, 3, 1), week[1])] == [
+        "2026-03-02",
+        "2026-03-09",
+    ]
+
+
+def test_rebuild_restores_sent_counts_from_ledger(tmp_path) -> None:
+    store = DedupeStore(tmp_path / "sent_jobs.json")
+    store.add("workday:walmart:R1", "2026-03-09T08:00:00+00:00")
+    store.add("workday:walmart:R2", "2026-03-09T09:00:00+00:00")
+    store.add("lever:spotify:a:b", "2026-03-08T09:00:00+00:00")
+    rollups = Rollups(tmp_path / "rollups.json")
+
+    assert rebuild_from_ledger(store, rollups) == 3
+    assert rollups.days["2026-03-09"]["workday:walmart"]["sent"] == 2
+    assert rollups.days["2026-03-08"]["lever:spotify"]["categories"] == {}
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from jobbot.config import DEFAULT_ROUTING, CategoryRule, RoutingConfig
+from jobbot.routing import KeywordAutomaton, Router
+
+
+def test_automaton_reports_overlapping_terms() -> None:
+    automaton = KeywordAutomaton([("data engineer", False), ("engineer", False), ("eng", True)])
+    assert automaton.find("senior data engineer") == {0, 1}
+    assert automaton.find("eng lead") == {2}
+
+
+def test_default_routing_matches_previous_categories() -> None:
+    router = Router(DEFAULT_ROUTING)
+    assert router.route("Senior Data Engineer, Software Platform").category == "data"
+    assert router.route("Software Engineer").category == "software"
+    route = router.route("Product Designer")
+    assert route.category == "general" and not route.matched_keywords
+
+
+def test_exclude_terms_and_keyword_filter() -> None:
+    config = RoutingConfig(
+        categories=[
+            CategoryRule(name="ml", include=["ml"], exclude=["html"], word_boundary=True),
+            CategoryRule(name="backend", webhook="software", include=["backend"]),
+        ],
+    )
+    router = Router(config, keywords=["Engineer"])
+    assert router.route("ML Engineer").category == "ml"
+    assert router.route("HTML Backend Engineer").category == "backend"
+    assert router.webhook_for("backend") == "software"
+    assert not router.route("Backend Developer").matched_keywords
+    assert router.match_terms() == ["engineer"]
+    assert Router(config).match_terms() == ["ml", "backend"]
+
+
+def test_excluded_titles_do_not_match_without_keywords() -> None:
+    config = RoutingConfig(
+        categories=[
+            CategoryRule(name="software", include=["software"], exclude=["manager"]),
+            CategoryRule(name="leads", include=["engineering manager"]),
+        ],
+    )
+    route = Router(config).route("Software Engineering Manager")
+    assert route.matched_keywords and route.category == "leads"
+
+    router = Router(RoutingConfig(categories=config.categories[:1]))
+    route = router.route("Software Engineering Manager")
+    assert not route.matched_keywords and route.category == "general"
+    assert router.route("Software Engineer").matched_keywords
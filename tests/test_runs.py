@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from jobbot.models import JobPosting
+from jobbot.runs import prune_runs, read_runs, write_run
+from jobbot.scraper import SourceRef, SourceResult
+
+
+def test_run_log_round_trips_sources_and_jobs(tmp_path) -> None:
+    posted = datetime(2026, 3, 2, 9, 30, tzinfo=timezone.utc)
+    job = JobPosting(
+        uid="lever:spotify:a1",
+        provider="lever",
+        handle="spotify",
+        title="Data Engineer",
+        company="spotify",
+        location="Stockholm",
+        url="https://jobs.lever.co/spotify/a1",
+        posted_at=posted,
+    )
+    results = [
+        SourceResult(SourceRef("lever", "spotify"), [job]),
+        SourceResult(SourceRef("greenhouse", "gone"), [], "HTTPStatusError(404)"),
+    ]
+    started = datetime.now(timezone.utc)
+    write_run(
+        tmp_path,
+        started,
+        results,
+        skipped=["greenhouse:flaky"],
+        categories={job.uid: "data"},
+        fetched=40,
+        keywords=["software", "data engineer"],
+    )
+    old = write_run(tmp_path, started - timedelta(days=10), [])
+
+    assert prune_runs(tmp_path, keep_days=7) == 1
+    assert not old.exists()
+    [run] = read_runs(tmp_path)
+    assert run.started_at == started and run.fetched == 40
+    assert run.keywords == ["software", "data engineer"]
+    assert run.jobs == [(job, "data")]
+    assert [source["source"] for source in run.sources] == [
+        "lever:spotify",
+        "greenhouse:gone",
+        "greenhouse:flaky",
+    ]
+    assert run.sources[1]["error"] == "HTTPStatusError(404)"
+    assert run.sources[2]["skipped"] is True
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_read_runs_skips_older_files_without_parsing(tmp_path) -> None:
+    started = datetime(2026, 3, 2, 9, 30, tzinfo=timezone.utc)
+    write_run(tmp_path, started - timedelta(days=2), [])
+    newer = write_run(tmp_path, started, [], shard="1/2")
+    (tmp_path / "20260101T000000000000Z.jsonl").write_text("not json\n")
+
+    runs = read_runs(tmp_path, since=started - timedelta(days=1))
+
+    assert [run.path for run in runs] == [newer] and runs[0].shard == "1/2"
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from jobbot.config import ScrapeOptions, WorkdaySource
+from jobbot.scraper import (
+    SourceRef,
+    flatten,
+    iter_sources,
+    scrape_sources,
+    scrape_sources_async,
+    select_shard,
+    shard_of,
+)
+from jobbot.sources import greenhouse
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "boards-api.greenhouse.io":
+        handle = request.url.path.split("/")[3]
+        if handle == "broken":
+            return httpx.Response(500)
+        if handle == "slow":
+            raise httpx.ReadTimeout("slow board", request=request)
+        return httpx.Response(
+            200,
+            json={"jobs": [{"id": 1, "title": "Software Engineer", "absolute_url": "https://x"}]},
+        )
+    return httpx.Response(
+        200,
+        json=[{"id": "abc", "text": "Data Engineer", "hostedUrl": "https://y", "createdAt": 0}],
+    )
+
+
+def test_async_scrape_isolates_failing_sources() -> None:
+    async def run() -> list:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+            return await scrape_sources_async(
+                iter_sources(["stripe", "broken", "slow", "figma"], ["spotify"]),
+                options=ScrapeOptions(max_concurrency=2),
+                client=client,
+            )
+
+    jobs = flatten(asyncio.run(run()))
+    assert [job.uid for job in jobs] == [
+        "greenhouse:stripe:1",
+        "greenhouse:figma:1",
+        "lever:spotify:abc",
+    ]
+
+
+def test_shards_partition_sources_stably() -> None:
+    refs = [SourceRef("greenhouse", f"board{i}") for i in range(50)]
+    refs += [
+        SourceRef("workday", "acme", WorkdaySource(tenant="acme", site=site, host="acme.wd5"))
+        for site in ("External", "Campus")
+    ]
+    shards = [select_shard(refs, index, 3) for index in (1, 2, 3)]
+
+    assert sorted(ref.key for shard in shards for ref in shard) == sorted(ref.key for ref in refs)
+    assert all(shards)
+    assert len({shard_of(ref, 3) for ref in refs if ref.provider == "workday"}) == 1
+    # Pinned so a change to the hash (which would reshuffle live shards) is deliberate.
+    pinned = [shard_of(SourceRef("greenhouse", h), 4) for h in ("stripe", "figma", "airbnb")]
+    assert pinned == [2, 4, 4]
+
+
+def test_sync_scrape_isolates_failing_sources(monkeypatch) -> None:
+    def fetch_jobs(handle: str, **options) -> list:
+        if handle == "renamed":
+            request = httpx.Request("GET", "https://boards-api.greenhouse.io")
+            raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404))
+        return greenhouse.parse_jobs(handle, {"jobs": [{"id": 1, "title": "Engineer"}]})
+
+    monkeypatch.setattr(greenhouse, "fetch_jobs", fetch_jobs)
+    results = scrape_sources([SourceRef("greenhouse", "renamed"), SourceRef("greenhouse", "stripe")])
+
+    assert [result.ok for result in results] == [False, True]
+    assert "HTTPStatusError" in results[0].error
+    assert [job.uid for job in flatten(results)] == ["greenhouse:stripe:1"]
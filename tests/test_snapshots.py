@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from datetime import date
+
+import httpx
+
+from jobbot.config import DEFAULT_ROUTING
+from jobbot.filters import Prefilter
+from jobbot.routing import Router
+from jobbot.snapshots import BoardSnapshots
+from jobbot.sources import greenhouse
+
+
+def _board(*jobs: tuple[int, str]) -> dict:
+    return {"jobs": [{"id": i, "title": "Engineer", "updated_at": ts} for i, ts in jobs]}
+
+
+def test_snapshots_emit_only_added_or_updated_jobs(tmp_path: Path, monkeypatch) -> None:
+    board = {"body": _board((1, "2026-01-01"), (2, "2026-01-01"))}
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=board["body"]))
+        return real_client(transport=transport, **kwargs)
+
+    monkeypatch.setattr(greenhouse.httpx, "Client", client_factory)
+    path = tmp_path / "snapshots.json"
+    snapshots = BoardSnapshots(path)
+
+    def poll() -> list[str]:
+        jobs = greenhouse.fetch_jobs("acme", snapshots=snapshots)
+        return [job.uid for job in jobs]
+
+    assert poll() == ["greenhouse:acme:1", "greenhouse:acme:2"]
+    snapshots.commit()
+    snapshots.save()
+
+    snapshots = BoardSnapshots(path)
+    assert poll() == []
+    assert snapshots.changed("greenhouse:acme") is False
+    assert snapshots.added("greenhouse:acme") == 0
+
+    board["body"] = _board((1, "2026-01-01"), (2, "2026-01-03"), (3, "2026-01-03"))
+    [updated, added] = greenhouse.fetch_jobs("acme", snapshots=snapshots)
+    assert [updated.uid, added.uid] == ["greenhouse:acme:2", "greenhouse:acme:3"]
+    assert snapshots.changed("greenhouse:acme") is True
+    # The update counts as a change, but only job 3 is new.
+    assert snapshots.added("greenhouse:acme") == 1
+    snapshots.forget(added)
+    snapshots.commit()
+
+    # A job whose delivery failed is emitted again even though the body is unchanged.
+    assert poll() == ["greenhouse:acme:3"]
+
+
+def test_snapshots_reset_when_the_router_changes(tmp_path: Path, monkeypatch) -> None:
+    body = {"jobs": [{"id": 1, "title": "Software Engineer", "updated_at": "2026-01-02"}]}
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        greenhouse.httpx,
+        "Client",
+        lambda **kwargs: real_client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json=body)),
+            **kwargs,
+        ),
+    )
+    path = tmp_path / "snapshots.json"
+
+    def run(router: Router) -> list[str]:
+        snapshots = BoardSnapshots(path, router.digest())
+        keep = Prefilter(lambda uid: False, router, date(2026, 1, 1), date(2026, 1, 2))
+        jobs = greenhouse.fetch_jobs("acme", snapshots=snapshots, keep=keep)
+        snapshots.commit()
+        snapshots.save()
+        return [job.uid for job in jobs]
+
+    assert run(Router(DEFAULT_ROUTING, keywords=["nomatch"])) == []
+    # The job was dropped by the old filter, so the new one must see it again.
+    assert run(Router(DEFAULT_ROUTING)) == ["greenhouse:acme:1"]
+    assert run(Router(DEFAULT_ROUTING)) == []
+    keywords = Router(DEFAULT_ROUTING, ["a", "B"]).digest()
+    assert keywords == Router(DEFAULT_ROUTING, ["b", "a"]).digest()
+    assert keywords != Router(DEFAULT_ROUTING).digest()
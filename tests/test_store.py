@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
-from jobbot.store import DedupeStore
+import pytest
+
+from jobbot.store import DedupeStore, ShardStore, find_shard_deltas, merge_deltas
+from jobbot.store import main as store_main
 
 
 def test_store_adds_and_persists(tmp_path: Path) -> None:
@@ -13,3 +17,137 @@ def test_store_adds_and_persists(tmp_path: Path) -> None:
 
     store2 = DedupeStore(store_path)
     assert store2.has("foo")
+
+
+def test_save_appends_only_new_entries_to_segment(tmp_path: Path) -> None:
+    store_path = tmp_path / "store.json"
+    store = DedupeStore(store_path)
+    base_before = store_path.read_text()
+    store.add("foo", "2024-01-01T00:00:00Z")
+    store.save()
+    store.add("bar", "2024-01-02T00:00:00Z")
+    store.save()
+    store.save()
+
+    assert store_path.read_text() == base_before
+    (segment,) = store.segments()
+    assert len(segment.read_text().splitlines()) == 2
+
+
+def test_compact_folds_segments_into_base(tmp_path: Path) -> None:
+    store_path = tmp_path / "store.json"
+    store = DedupeStore(store_path)
+    store.add("foo", "2024-01-01T00:00:00Z")
+    store.save()
+    old = store.segment_dir / "2024-01-01.jsonl"
+    old.write_text('{"uid": "old", "ts": "2024-01-01T00:00:00Z"}\n{"uid": "torn"')
+
+    assert DedupeStore(store_path).compact(before=date(2024, 1, 2)) == 1
+
+    reloaded = DedupeStore(store_path)
+    assert reloaded.has("old") and reloaded.has("foo") and not reloaded.has("torn")
+    assert len(reloaded.segments()) == 1
+    assert "old" in store_path.read_text() and "foo" not in store_path.read_text()
+
+
+def test_failed_compact_keeps_segments(tmp_path: Path, monkeypatch) -> None:
+    store_path = tmp_path / "store.json"
+    store = DedupeStore(store_path)
+    old = store.segment_dir / "2024-01-01.jsonl"
+    old.parent.mkdir(parents=True, exist_ok=True)
+    old.write_text('{"uid": "old", "ts": "2024-01-01T00:00:00Z"}\n')
+
+    def disk_full(self, data):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(Path, "write_text", disk_full)
+    with pytest.raises(OSError):
+        DedupeStore(store_path).compact(before=date(2024, 1, 2))
+    monkeypatch.undo()
+
+    assert old.exists() and DedupeStore(store_path).has("old")
+
+
+def test_retention_demotes_old_entries_to_bloom(tmp_path: Path) -> None:
+    store_path = tmp_path / "store.json"
+    store = DedupeStore(store_path, retention_days=7)
+    store.add("ancient", "2020-01-01T00:00:00+00:00")
+    store.add("fresh", datetime.now(timezone.utc).isoformat())
+    store.save()
+
+    reloaded = DedupeStore(store_path, retention_days=7)
+    assert "ancient" not in reloaded.entries
+    assert reloaded.has("ancient") and reloaded.has("fresh")
+    assert not reloaded.has("never-seen")
+
+
+def test_eviction_batches_into_immutable_bloom_generations(tmp_path: Path) -> None:
+    store_path = tmp_path / "store.json"
+    today = datetime.now(timezone.utc)
+    store = DedupeStore(store_path, retention_days=30, bloom_generations=2)
+    store.add("recently-expired", (today - timedelta(days=33)).isoformat())
+    store.save()
+    # Only three days past the cutoff: wait for a full weekly batch.
+    assert "recently-expired" in DedupeStore(store_path).entries and not store.blooms
+
+    store.add("long-expired", (today - timedelta(days=40)).isoformat())
+    store.save()
+    (first,) = store.bloom_paths()
+    first_bytes = first.read_bytes()
+    assert not store.entries.keys() & {"recently-expired", "long-expired"}
+
+    for day in (1, 2):
+        store.add(f"uid-{day}", "2024-01-01T00:00:00+00:00")
+        assert store.evict(date(2024, 1, 1) + timedelta(days=day)) == 1
+        if day == 1:
+            assert first.read_bytes() == first_bytes
+    reloaded = DedupeStore(store_path, bloom_generations=2)
+    # The oldest generation was retired once a third one was written.
+    assert not first.exists() and len(reloaded.bloom_paths()) == 2
+    assert reloaded.has("uid-1") and reloaded.has("uid-2") and not reloaded.has("uid-3")
+
+def test_shard_deltas_merge_deterministically(tmp_path: Path) -> None:
+    store_path = tmp_path / "store.json"
+    ledger = DedupeStore(store_path)
+    ledger.add("seen", "2024-01-01T00:00:00Z")
+    ledger.save()
+
+    first = ShardStore(DedupeStore(store_path), 1, 2)
+    second = ShardStore(DedupeStore(store_path), 2, 2)
+    assert first.has("seen")
+    first.add("a", "2024-01-03T00:00:00Z")
+    first.add("both", "2024-01-05T00:00:00Z")
+    second.add("b", "2024-01-04T00:00:00Z")
+    second.add("both", "2024-01-02T00:00:00Z")
+    first.save()
+    second.save()
+    assert DedupeStore(store_path).entries == {"seen": "2024-01-01T00:00:00Z"}
+
+    deltas = find_shard_deltas(store_path)
+    assert [delta.name for delta in deltas] == [
+        "store.shard-1-of-2.json",
+        "store.shard-2-of-2.json",
+    ]
+    merged = DedupeStore(store_path)
+    assert merge_deltas(merged, list(reversed(deltas))) == 3
+    assert merge_deltas(merged, deltas) == 0
+    assert DedupeStore(store_path).entries == {
+        "seen": "2024-01-01T00:00:00Z",
+        "a": "2024-01-03T00:00:00Z",
+        "b": "2024-01-04T00:00:00Z",
+        "both": "2024-01-02T00:00:00Z",
+    }
+
+
+def test_merge_command_applies_retention(tmp_path: Path, monkeypatch) -> None:
+    store_path = tmp_path / "store.json"
+    shard = ShardStore(DedupeStore(store_path), 1, 2)
+    shard.add("old", "2024-01-03T00:00:00Z")
+    shard.add("new", datetime.now(timezone.utc).isoformat())
+    shard.save()
+    monkeypatch.setattr("sys.argv", ["store", "merge", "--store", str(store_path)])
+
+    assert store_main() == 0
+    ledger = DedupeStore(store_path)
+    assert list(ledger.entries) == ["new"]
+    assert ledger.has("old") and not find_shard_deltas(store_path)
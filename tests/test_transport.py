@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import httpx
+
+from jobbot.config import ScrapeOptions, WorkdaySource
+from jobbot.scraper import SourceRef, scrape_sources
+from jobbot.sources import workday
+from jobbot.transport import borrow_client, build_client
+
+
+def test_sources_share_one_pooled_client(monkeypatch) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.host == "api.lever.co":
+            return httpx.Response(200, json=[])
+        return httpx.Response(200, json={"jobs": [{"id": 1, "title": "Data Engineer"}]})
+
+    real_client = httpx.Client
+    clients: list[httpx.Client] = []
+
+    def client_factory(**kwargs):
+        clients.append(real_client(transport=httpx.MockTransport(handler), **kwargs))
+        return clients[-1]
+
+    monkeypatch.setattr(httpx, "Client", client_factory)
+    client = build_client(ScrapeOptions(max_concurrency=3))
+    refs = [SourceRef("greenhouse", "stripe"), SourceRef("lever", "spotify")]
+
+    with client:
+        results = scrape_sources(refs, client=client)
+
+    assert [len(result.jobs) for result in results] == [1, 0]
+    assert clients == [client]
+    (encodings,) = {request.headers["accept-encoding"] for request in requests}
+    assert "gzip" in encodings
+    assert {request.headers["user-agent"] for request in requests} == {"job-discord-bot/1.0"}
+
+
+def test_borrowed_client_is_left_open() -> None:
+    with httpx.Client() as owned:
+        with borrow_client(owned) as client:
+            assert client is owned
+        assert not owned.is_closed
+    with borrow_client(None) as client:
+        assert "gzip" in client.headers["accept-encoding"]
+    assert client.is_closed
+
+
+def test_shared_client_keeps_per_request_timeouts_and_workday_user_agent() -> None:
+    seen: list[tuple[str, str, float]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeout = request.extensions["timeout"]["read"]
+        seen.append((request.method, request.headers["user-agent"], timeout))
+        if request.method == "GET":
+            return httpx.Response(200, text='<script>{"csrfToken":"tok"}</script>')
+        return httpx.Response(200, json={"total": 0, "jobPostings": []})
+
+    config = WorkdaySource(tenant="acme", site="Careers", host="acme.wd5.myworkdayjobs.com")
+    with httpx.Client(transport=httpx.MockTransport(handler), timeout=30.0) as client:
+        workday.fetch_jobs(config, client=client)
+
+    assert seen == [
+        ("GET", "job-discord-bot/1.2", workday.TIMEOUT),
+        ("POST", "job-discord-bot/1.2", workday.TIMEOUT),
+    ]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from scripts import verify_vendor_map as vendor_map
+from scripts.verify_vendor_map import ProbeCache, VendorEntry, cache_key, load_candidates
+
+
+def test_probe_cache_expires_and_keeps_only_definitive_answers(tmp_path: Path) -> None:
+    path = tmp_path / "vendor_probe.json"
+    cache = ProbeCache(path, ttl=60)
+    cache.put("gh:stripe:counts", ("OK", 12), now=1000)
+    cache.put("gh:gone:counts", ("HTTP 404", None), now=1000)
+    cache.put("gh:busy:counts", ("HTTP 429", None), now=1000)
+    cache.put("gh:down:counts", ("HTTP 503", None), now=1000)
+    cache.save()
+
+    reloaded = ProbeCache(path, ttl=60)
+    assert sorted(reloaded.results) == ["gh:gone:counts", "gh:stripe:counts"]
+    assert reloaded.get("gh:stripe:counts", now=1060) == ("OK", 12)
+    assert reloaded.get("gh:stripe:counts", now=1061) is None
+    assert ProbeCache(path, ttl=0).get("gh:gone:counts", now=1000) == ("HTTP 404", None)
+
+
+def test_cached_probe_without_counts_is_not_reused_for_counts(tmp_path: Path, monkeypatch) -> None:
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"jobs": [{"id": 1}, {"id": 2}]})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    cache = ProbeCache(tmp_path / "vendor_probe.json", ttl=3600)
+    entries = [VendorEntry("stripe", "Greenhouse", "gh", handle="stripe")]
+
+    def probe(counts: bool) -> list[dict]:
+        return asyncio.run(vendor_map.probe_all(entries, cache, concurrency=1, counts=counts))
+
+    assert probe(False)[0] == {"company": "stripe", "vendor": "Greenhouse", "status": "OK"}
+    assert probe(True)[0]["jobs"] == 2
+    assert probe(True)[0]["jobs"] == 2
+    assert requests == ["/v1/boards/stripe", "/v1/boards/stripe/jobs"]
+    assert cache_key(entries[0], True) != cache_key(entries[0], False)
+
+
+def test_load_candidates_honours_vendor_prefixes(tmp_path: Path) -> None:
+    path = tmp_path / "candidates.txt"
+    path.write_text("Stripe\n# comment\n\ngreenhouse:figma  # design\nlever:spotify\n")
+
+    entries = load_candidates(path)
+
+    assert [(entry.kind, entry.handle) for entry in entries] == [
+        ("gh", "stripe"),
+        ("lever", "stripe"),
+        ("gh", "figma"),
+        ("lever", "spotify"),
+    ]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from jobbot.config import WorkdaySource
+from jobbot.sources import workday
+
+CONFIG = WorkdaySource(tenant="acme", site="Careers", host="acme.wd5.myworkdayjobs.com", limit=2)
+
+
+def _page(labels: list[str], start: int) -> dict:
+    return {
+        "total": 10,
+        "jobPostings": [
+            {"title": f"Job {start + i}", "externalPath": f"/job/{start + i}", "postedOn": label}
+            for i, label in enumerate(labels)
+        ],
+    }
+
+
+def test_iter_pages_stops_once_page_leaves_window() -> None:
+    pages = [
+        ["Posted Today", "Posted Yesterday"],
+        ["Posted Yesterday", "Posted 3 Days Ago"],
+        ["Posted 5 Days Ago", "Posted 6 Days Ago"],
+    ]
+    offsets: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = json.loads(request.content)["offset"]
+        offsets.append(offset)
+        return httpx.Response(200, json=_page(pages[offset // 2], offset))
+
+    since = (datetime.now(timezone.utc) - timedelta(days=1)).date()
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        result = list(workday.iter_pages(client, CONFIG, None, since=since))
+
+    assert offsets == [0, 2]
+    assert [len(page) for page in result] == [2, 2]
+
+
+def test_iter_pages_walks_until_short_page() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = json.loads(request.content)["offset"]
+        labels = ["Posted Today"] * (2 if offset < 4 else 1)
+        return httpx.Response(200, json=_page(labels, offset))
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        result = list(workday.iter_pages(client, CONFIG, None))
+
+    assert sum(len(page) for page in result) == 5
+
+
+def test_session_cache_skips_bootstrap_until_rejected(tmp_path, monkeypatch) -> None:
+    calls: list[str] = []
+    valid_tokens = {"tok-1"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            token = f"tok-{len([c for c in calls if c == 'GET']) + 1}"
+            calls.append("GET")
+            valid_tokens.add(token)
+            return httpx.Response(200, headers={"Set-Cookie": f"CALYPSO_CSRF_TOKEN={token}"})
+        calls.append("POST")
+        if request.headers.get("wd-csrf-token") not in valid_tokens:
+            return httpx.Response(403)
+        return httpx.Response(200, json=_page(["Posted Today"], 0))
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        workday.httpx,
+        "Client",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    path = tmp_path / "sessions.json"
+    sessions = workday.WorkdaySessionCache(path)
+    assert len(workday.fetch_jobs(CONFIG, sessions=sessions)) == 1
+    sessions.save()
+
+    assert len(workday.fetch_jobs(CONFIG, sessions=workday.WorkdaySessionCache(path))) == 1
+    assert calls == ["GET", "POST", "POST"]
+
+    valid_tokens.discard("tok-1")
+    assert len(workday.fetch_jobs(CONFIG, sessions=workday.WorkdaySessionCache(path))) == 1
+    assert calls[3:] == ["POST", "GET", "POST"]